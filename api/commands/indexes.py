@@ -0,0 +1,43 @@
+import argparse
+import logging
+import sys
+
+from api.dependencies.database import get_database
+from api.repositories.stocks import StockMetadataRepository
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Create and verify the stocks collection indexes."
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="only report missing indexes, without creating them",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+
+    stock_metadata_repository = StockMetadataRepository(get_database())
+
+    if not args.check:
+        logging.info("creating indexes...")
+        failed = stock_metadata_repository.ensure_indexes()
+
+        if failed:
+            logging.error(f"could not create indexes {failed}")
+            sys.exit(1)
+
+    missing = stock_metadata_repository.missing_indexes()
+
+    if missing:
+        logging.error(f"sortable fields without an index {missing}")
+        sys.exit(1)
+
+    logging.info("every sortable field is indexed")
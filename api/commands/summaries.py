@@ -0,0 +1,100 @@
+import argparse
+import asyncio
+import logging
+import sys
+
+from fastapi import HTTPException
+
+from api.config.settings import get_settings
+from api.dependencies.cache import get_series_cache, get_sidecar_cache
+from api.dependencies.database import get_database
+from api.dependencies.depends import build_series_repository
+from api.dependencies.storage import get_download_executor, get_storage_client
+from api.repositories.stocks import StockMetadataRepository
+from api.schemas.stock import StockFileType
+from api.services.stocks import StockService
+
+
+def build_service(
+    stock_metadata_repository: StockMetadataRepository,
+) -> StockService:
+    """Build a StockService with the process-wide dependencies."""
+    settings = get_settings()
+
+    series_repositories = {
+        file_format: build_series_repository(
+            settings,
+            file_format,
+            client=get_storage_client(),
+            executor=get_download_executor(),
+        )
+        for file_format in StockFileType
+    }
+
+    return StockService(
+        stock_metadata_repository=stock_metadata_repository,
+        csv_stock_series_repository=series_repositories[StockFileType.CSV],
+        excel_stock_series_repository=series_repositories[StockFileType.EXCEL],
+        json_stock_series_repository=series_repositories[StockFileType.JSON],
+        parquet_stock_series_repository=series_repositories[
+            StockFileType.PARQUET
+        ],
+        series_cache=get_series_cache(),
+        batch_concurrency=settings.SERIES_BATCH_CONCURRENCY,
+        csv_engine=settings.SERIES_CSV_ENGINE,
+        sidecar_cache=get_sidecar_cache(),
+    )
+
+
+async def summarize_stocks(
+    stock_metadata_repository: StockMetadataRepository,
+    service: StockService,
+    symbol: str = None,
+) -> int:
+    """Compute and store the summary of every stock, or of `symbol`.
+
+    Returns the number of stocks that could not be summarized.
+    """
+    filter = {"symbol": symbol} if symbol else {}
+    stocks = stock_metadata_repository.list_all(filter)
+
+    failed = 0
+    for stock in stocks:
+        try:
+            summary = await service.summarize(stock.id)
+        except HTTPException as e:
+            logging.error(f"could not summarize [{stock.symbol}]: {e.detail}")
+            failed += 1
+            continue
+
+        logging.info(f"summarized [{stock.symbol}]: {summary}")
+
+    return failed
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Compute and store stock series summary statistics."
+    )
+    parser.add_argument(
+        "--symbol", help="only summarize the stock with this symbol"
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+
+    stock_metadata_repository = StockMetadataRepository(get_database())
+    service = build_service(stock_metadata_repository)
+
+    failed = asyncio.run(
+        summarize_stocks(stock_metadata_repository, service, args.symbol)
+    )
+
+    if failed:
+        logging.error(f"{failed} stocks could not be summarized")
+        sys.exit(1)
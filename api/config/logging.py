@@ -1,6 +1,17 @@
 import logging
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Iterable, TextIO
 
-from starlette_context import context
+import orjson
+
+from api.utils.request_id import get_current_request_id
+
+TEXT_FORMAT = "%(asctime)s | %(request_id)s | %(levelname)s - %(message)s"
+DEFAULT_REQUEST_ID = "00000000-0000-0000-0000-000000000042"
+
+_exception_formatter = logging.Formatter()
 
 
 class RequestIdFilter(logging.Filter):
@@ -11,21 +22,132 @@ class RequestIdFilter(logging.Filter):
 
     def filter(self, record: logging.LogRecord) -> bool:
         """Filter function."""
-        try:
-            record.request_id = context.request_id
-        except AttributeError:
-            pass
+        request_id = get_current_request_id()
+
+        if request_id is not None:
+            record.request_id = request_id
 
         return True
 
 
-class RequestIdFormatterHandler(logging.StreamHandler):
-    """Intercept handler."""
+class RequestQueueHandler(QueueHandler):
+    """Queue handler that prepares records with as little work as possible.
+
+    Only the message arguments and the exception are rendered, since they
+    may not be safe to use from another thread, and the record is enqueued
+    as it is instead of a copy. Formatting is left to the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Prepare a record to be enqueued."""
+        record.msg = record.getMessage()
+        record.args = None
+
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(
+                record.exc_info
+            )
+            record.exc_info = None
 
-    def format(self, record: logging.LogRecord) -> None:
+        return record
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formatter of records as JSON lines.
+
+    Lines have the record time, level, logger, request id and message, and
+    the stage timings in milliseconds of records logged with a `timings`
+    extra (seconds by stage).
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
         """Format the specified record."""
-        fmt = logging.Formatter(
-            "%(asctime)s | %(request_id)s | %(levelname)s - %(message)s",
-            defaults={"request_id": "00000000-0000-0000-0000-000000000042"},
-        )
-        return fmt.format(record)
+        entry = {
+            "time": datetime.fromtimestamp(
+                record.created, tz=timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", None),
+            "message": record.getMessage(),
+        }
+
+        timings = getattr(record, "timings", None)
+        if timings:
+            entry["timings_ms"] = {
+                name: round(seconds * 1000, 2)
+                for name, seconds in timings.items()
+            }
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+
+        return orjson.dumps(entry).decode()
+
+
+class RequestIdFormatterHandler(logging.StreamHandler):
+    """Stream handler of records with their request id.
+
+    Records are formatted as text lines, or as JSON lines if `json_lines`,
+    by a formatter built once for the handler.
+    """
+
+    def __init__(
+        self, stream: TextIO = None, json_lines: bool = False
+    ) -> None:
+        super().__init__(stream)
+
+        if json_lines:
+            self.setFormatter(JsonLinesFormatter())
+        else:
+            self.setFormatter(
+                logging.Formatter(
+                    TEXT_FORMAT, defaults={"request_id": DEFAULT_REQUEST_ID}
+                )
+            )
+
+
+def configure_logging(
+    level: str,
+    json_lines: bool = False,
+    logger_names: Iterable[str] = (),
+    stream: TextIO = None,
+) -> QueueListener:
+    """Log through a queue, formatted and written on a background thread.
+
+    The root logger gets a handler that tags records with the request id
+    and enqueues them, without formatting them. The returned listener,
+    already started, formats and writes them, and must be stopped to flush
+    the queue. The handlers of `logger_names` (e.g. uvicorn loggers) are
+    dropped, so their records propagate to the root logger, other loggers
+    are left as they are.
+
+    Parameters:
+    level (str): level of the root logger, e.g. "INFO".
+    json_lines (bool): write JSON lines instead of text lines.
+    logger_names (list[str]): loggers to route through the root logger.
+    stream (TextIO): stream to write to, stderr if not set.
+    """
+    log_queue = queue.SimpleQueue()
+
+    queue_handler = RequestQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter("request_id"))
+
+    root_logger = logging.getLogger()
+    root_logger.handlers = [queue_handler]
+    root_logger.setLevel(level)
+
+    for name in logger_names:
+        logger = logging.getLogger(name)
+        logger.handlers = []
+        logger.propagate = True
+
+    listener = QueueListener(
+        log_queue, RequestIdFormatterHandler(stream, json_lines=json_lines)
+    )
+    listener.start()
+
+    return listener
@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
@@ -13,9 +14,57 @@ class Settings(BaseSettings):
 
     MONGO_DATABASE: str = os.getenv("MONGO_DATABASE")
     MONGO_URI: str = os.getenv("MONGO_URI")
+    ENSURE_INDEXES_ON_STARTUP: bool = (
+        os.getenv("ENSURE_INDEXES_ON_STARTUP", "true").lower() == "true"
+    )
+
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    # "text" lines, or "json" lines with request id and stage timings.
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text")
+    # Share of successful requests whose request line is logged.
+    LOG_REQUEST_SAMPLE_RATE: float = float(
+        os.getenv("LOG_REQUEST_SAMPLE_RATE", 1.0)
+    )
 
     STOCKS_BUCKET: str = os.getenv("STOCKS_BUCKET")
 
+    # "gcs" serves series from STOCKS_BUCKET, "filesystem" from STORAGE_ROOT,
+    # a local directory laid out like the bucket.
+    STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "gcs")
+    STORAGE_ROOT: str = os.getenv("STORAGE_ROOT", "infra/data/stocks-bucket")
+
+    STORAGE_POOL_SIZE: int = int(os.getenv("STORAGE_POOL_SIZE", 32))
+    STORAGE_DOWNLOAD_WORKERS: int = int(
+        os.getenv("STORAGE_DOWNLOAD_WORKERS", 8)
+    )
+    STORAGE_RANGED_DOWNLOAD_THRESHOLD: int = int(
+        os.getenv("STORAGE_RANGED_DOWNLOAD_THRESHOLD", 8 * 1024 * 1024)
+    )
+    STORAGE_RANGED_DOWNLOAD_CHUNK_SIZE: int = int(
+        os.getenv("STORAGE_RANGED_DOWNLOAD_CHUNK_SIZE", 2 * 1024 * 1024)
+    )
+
+    SERIES_BATCH_MAX_IDS: int = int(os.getenv("SERIES_BATCH_MAX_IDS", 50))
+    SERIES_BATCH_CONCURRENCY: int = int(
+        os.getenv("SERIES_BATCH_CONCURRENCY", 8)
+    )
+
+    SERIES_CSV_ENGINE: str = os.getenv("SERIES_CSV_ENGINE", "c")
+
+    SERIES_CACHE_MAX_BYTES: int = int(
+        os.getenv("SERIES_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+    )
+    # Series blob metadata is revalidated with storage after this many
+    # seconds, disabled if 0.
+    SERIES_BLOB_TTL_SECONDS: float = float(
+        os.getenv("SERIES_BLOB_TTL_SECONDS", 30)
+    )
+    # Parquet sidecars of excel series, disabled if empty.
+    SERIES_SIDECAR_DIR: str = os.getenv(
+        "SERIES_SIDECAR_DIR",
+        os.path.join(tempfile.gettempdir(), "stocks-api-sidecars"),
+    )
+
 
 def get_settings() -> Settings:
     """Get instance of settings."""
@@ -0,0 +1,37 @@
+from typing import Optional
+
+from api.config.settings import get_settings
+from api.services.cache import SeriesCache, SeriesSidecarCache
+from api.utils.ttl_cache import TTLCache
+
+_series_cache = None
+_sidecar_cache = None
+_blob_cache = None
+
+
+def get_series_cache() -> SeriesCache:
+    """Get process-wide SeriesCache instance."""
+    global _series_cache
+    if _series_cache is None:
+        _series_cache = SeriesCache(get_settings().SERIES_CACHE_MAX_BYTES)
+    return _series_cache
+
+
+def get_sidecar_cache() -> Optional[SeriesSidecarCache]:
+    """Get process-wide SeriesSidecarCache, None if it is disabled."""
+    global _sidecar_cache
+    if _sidecar_cache is None:
+        directory = get_settings().SERIES_SIDECAR_DIR
+        if directory:
+            _sidecar_cache = SeriesSidecarCache(directory)
+    return _sidecar_cache
+
+
+def get_blob_cache() -> Optional[TTLCache]:
+    """Get process-wide cache of series blob metadata, None if disabled."""
+    global _blob_cache
+    if _blob_cache is None:
+        ttl = get_settings().SERIES_BLOB_TTL_SECONDS
+        if ttl > 0:
+            _blob_cache = TTLCache(ttl)
+    return _blob_cache
@@ -1,21 +1,34 @@
+from concurrent.futures import Executor
 from typing import Callable
 
 from fastapi import Depends
+from google.cloud.storage import Client
 from pymongo.database import Database
 
 from api.config.settings import Settings, get_settings
+from api.dependencies.cache import (
+    get_blob_cache,
+    get_series_cache,
+    get_sidecar_cache,
+)
 from api.dependencies.database import get_database
+from api.dependencies.storage import get_download_executor, get_storage_client
 from api.repositories.base import BaseRepository
 from api.repositories.stocks import StockMetadataRepository
-from api.repositories.storage import StockSeriesRepository
+from api.repositories.storage import (
+    FileSystemStockSeriesRepository,
+    StockSeriesRepository,
+)
 from api.schemas.stock import StockFileType
+from api.services.cache import SeriesCache, SeriesSidecarCache
 from api.services.stocks import StockService
+from api.utils.ttl_cache import TTLCache
 
 
 def get_repository(
     repo_type: type[BaseRepository],
     series_format: str = None,
-) -> Callable[[Database], BaseRepository]:
+) -> Callable[..., BaseRepository]:
     """Get a repository as callable."""
     if repo_type is StockMetadataRepository:
 
@@ -24,6 +37,46 @@ def get_repository(
 
         return _get_repo
 
+    if repo_type is StockSeriesRepository:
+
+        def _get_series_repo(
+            settings: Settings = Depends(get_settings),
+            client: Client = Depends(get_storage_client),
+            executor: Executor = Depends(get_download_executor),
+        ) -> StockSeriesRepository:
+            return build_series_repository(
+                settings, series_format, client, executor
+            )
+
+        return _get_series_repo
+
+
+def build_series_repository(
+    settings: Settings,
+    series_format: str,
+    client: Client = None,
+    executor: Executor = None,
+) -> StockSeriesRepository:
+    """Build the series repository of the configured storage backend."""
+    if settings.STORAGE_BACKEND == "filesystem":
+        return FileSystemStockSeriesRepository(
+            settings.STORAGE_ROOT, series_format
+        )
+
+    if settings.STORAGE_BACKEND != "gcs":
+        raise ValueError(
+            f"Unknown storage backend [{settings.STORAGE_BACKEND}]."
+        )
+
+    return StockSeriesRepository(
+        settings.STOCKS_BUCKET,
+        series_format,
+        client=client,
+        executor=executor,
+        ranged_download_threshold=settings.STORAGE_RANGED_DOWNLOAD_THRESHOLD,
+        ranged_download_chunk_size=settings.STORAGE_RANGED_DOWNLOAD_CHUNK_SIZE,
+    )
+
 
 def get_service(service_type: type[any]) -> Callable:
     """Get a service as callable."""
@@ -33,23 +86,36 @@ def get_service(service_type: type[any]) -> Callable:
             stock_metadata_repository: BaseRepository = Depends(
                 get_repository(StockMetadataRepository)
             ),
+            csv_stock_series_repository: StockSeriesRepository = Depends(
+                get_repository(StockSeriesRepository, StockFileType.CSV)
+            ),
+            excel_stock_series_repository: StockSeriesRepository = Depends(
+                get_repository(StockSeriesRepository, StockFileType.EXCEL)
+            ),
+            json_stock_series_repository: StockSeriesRepository = Depends(
+                get_repository(StockSeriesRepository, StockFileType.JSON)
+            ),
+            parquet_stock_series_repository: StockSeriesRepository = Depends(
+                get_repository(StockSeriesRepository, StockFileType.PARQUET)
+            ),
+            series_cache: SeriesCache = Depends(get_series_cache),
+            sidecar_cache: SeriesSidecarCache = Depends(get_sidecar_cache),
+            blob_cache: TTLCache = Depends(get_blob_cache),
             settings: Settings = Depends(get_settings),
         ) -> StockService:
-            csv_stock_series_repository = StockSeriesRepository(
-                settings.STOCKS_BUCKET, StockFileType.CSV
-            )
-            excel_stock_series_repository = StockSeriesRepository(
-                settings.STOCKS_BUCKET, StockFileType.EXCEL
-            )
-            json_stock_series_repository = StockSeriesRepository(
-                settings.STOCKS_BUCKET, StockFileType.JSON
-            )
-
             return StockService(
                 stock_metadata_repository=stock_metadata_repository,
                 csv_stock_series_repository=csv_stock_series_repository,
                 excel_stock_series_repository=excel_stock_series_repository,
                 json_stock_series_repository=json_stock_series_repository,
+                parquet_stock_series_repository=(
+                    parquet_stock_series_repository
+                ),
+                series_cache=series_cache,
+                batch_concurrency=settings.SERIES_BATCH_CONCURRENCY,
+                csv_engine=settings.SERIES_CSV_ENGINE,
+                sidecar_cache=sidecar_cache,
+                blob_cache=blob_cache,
             )
 
         return _service
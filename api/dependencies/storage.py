@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import requests
+from google.auth.credentials import AnonymousCredentials
+from google.cloud.storage import Client
+from requests.adapters import HTTPAdapter
+
+from api.config.settings import get_settings
+
+_storage_client = None
+_download_executor = None
+
+
+def get_storage_client() -> Optional[Client]:
+    """Get process-wide storage Client instance.
+
+    The client shares one HTTP session with a connection pool sized by
+    `STORAGE_POOL_SIZE`, so connections are kept alive across requests.
+    There is no client, and None is returned, unless the storage backend is
+    "gcs".
+    """
+    global _storage_client
+    if _storage_client is None:
+        settings = get_settings()
+        if settings.STORAGE_BACKEND != "gcs":
+            return None
+
+        pool_size = settings.STORAGE_POOL_SIZE
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        _storage_client = Client(
+            credentials=AnonymousCredentials(), _http=session
+        )
+    return _storage_client
+
+
+def get_download_executor() -> ThreadPoolExecutor:
+    """Get process-wide executor for parallel ranged downloads."""
+    global _download_executor
+    if _download_executor is None:
+        _download_executor = ThreadPoolExecutor(
+            max_workers=get_settings().STORAGE_DOWNLOAD_WORKERS,
+            thread_name_prefix="storage-download",
+        )
+    return _download_executor
@@ -3,17 +3,22 @@ import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from api.config.logging import RequestIdFilter, RequestIdFormatterHandler
+from api.config.logging import configure_logging
 from api.config.settings import get_settings
+from api.dependencies.database import get_database
 from api.middlewares.logging import RequestIdLoggingMiddleware
-from api.routes import api
+from api.repositories.stocks import StockMetadataRepository
+from api.routes import api, metrics
 
-LOG_LEVEL = logging.getLevelName("INFO")
+# Loggers that come with their own handlers, routed through the app logging.
+ROUTED_LOGGERS = ["uvicorn", "uvicorn.access"]
 
 app = FastAPI()
 
 settings = get_settings()
 
+_log_listener = None
+
 origins = ["*"]
 
 app.add_middleware(
@@ -26,15 +31,47 @@ app.add_middleware(
 
 
 def setup_logging() -> None:
-    """Configure logging across entire app."""
-    loggers = list(logging.root.manager.loggerDict.keys())
-    loggers.append("root")
-    for name in loggers:
-        logger = logging.getLogger(name)
-        logger.handlers = [RequestIdFormatterHandler()]
-        logger.filters = [RequestIdFilter("request_id")]
-        logger.level = LOG_LEVEL
-        logger.propagate = False
+    """Configure logging across entire app.
+
+    Records are enqueued by the logging call and written by a background
+    listener, replacing the listener of a previous setup.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+
+    _log_listener = configure_logging(
+        settings.LOG_LEVEL,
+        json_lines=settings.LOG_FORMAT == "json",
+        logger_names=ROUTED_LOGGERS,
+    )
+
+
+def stop_logging() -> None:
+    """Write the records still queued and stop the logging listener.
+
+    Later records are written directly by the listener handlers.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        logging.getLogger().handlers = list(_log_listener.handlers)
+        _log_listener = None
+
+
+def setup_indexes() -> None:
+    """Create missing database indexes and report unindexed sort fields."""
+    stock_metadata_repository = StockMetadataRepository(get_database())
+
+    try:
+        stock_metadata_repository.ensure_indexes()
+        missing = stock_metadata_repository.missing_indexes()
+    except Exception as e:
+        logging.error(f"Could not verify database indexes. Error [{e}].")
+        return
+
+    if missing:
+        logging.warning(f"Sortable fields without an index {missing}.")
 
 
 @app.on_event("startup")
@@ -42,6 +79,19 @@ def app_startup_event() -> None:
     """Startup event."""
     setup_logging()
 
+    if settings.ENSURE_INDEXES_ON_STARTUP:
+        setup_indexes()
+
+
+@app.on_event("shutdown")
+def app_shutdown_event() -> None:
+    """Shutdown event."""
+    stop_logging()
 
-app.add_middleware(RequestIdLoggingMiddleware)
+
+app.add_middleware(
+    RequestIdLoggingMiddleware,
+    log_sample_rate=settings.LOG_REQUEST_SAMPLE_RATE,
+)
 app.include_router(api.endpoint_router, prefix=settings.API_V1_PREFIX)
+app.include_router(metrics.router)
@@ -1,24 +1,111 @@
-from fastapi import Request
-from starlette.middleware.base import (
-    BaseHTTPMiddleware,
-    RequestResponseEndpoint,
+import logging
+import random
+import time
+from typing import Dict
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.utils.metrics import observe_request, requests_in_flight, route_path
+from api.utils.request_id import (
+    get_request_id,
+    reset_current_request_id,
+    set_current_request_id,
+)
+from api.utils.timing import (
+    get_timings,
+    server_timing,
+    start_timings,
+    stop_timings,
 )
-from starlette.responses import Response
-from starlette_context import context
 
-from api.utils.request_id import get_request_id
+REQUEST_ID_HEADER = "X-Request-ID"
+
+
+class RequestIdLoggingMiddleware:
+    """ASGI middleware that tags every request with a request id.
+
+    The id is the `X-Request-ID` of the request, or a new one if it has
+    none or it is not a short id of letters, digits, ".", "_" and "-", and
+    is echoed in the response `X-Request-ID` header and in every log
+    record. Every
+    request is logged with its status, total time and the time spent in
+    each stage (mongo, storage, download, parse, validation, encoding),
+    which is also sent in the Server-Timing response header. Request
+    counts, latencies and requests in flight are recorded as metrics.
+
+    Only a `log_sample_rate` share of the request lines of successful
+    requests is logged, server errors are always logged.
+
+    Response messages are passed through as they are, only the headers of
+    the response start are extended, so bodies are never copied or
+    buffered and streamed responses keep their backpressure.
+    """
+
+    def __init__(self, app: ASGIApp, log_sample_rate: float = 1.0) -> None:
+        self.app = app
+        self.log_sample_rate = log_sample_rate
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        """Serve a request."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = get_request_id(
+            Headers(scope=scope).get(REQUEST_ID_HEADER)
+        )
+        request_id_token = set_current_request_id(request_id)
+
+        start = time.perf_counter()
+        timings_token = start_timings()
+        status_code = 500
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status_code
+
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+                timings = get_timings()
+                timings["total"] = time.perf_counter() - start
+
+                headers = MutableHeaders(scope=message)
+                headers.append(REQUEST_ID_HEADER, request_id)
+                headers.append("Server-Timing", server_timing(timings))
+
+            await send(message)
 
+        requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            requests_in_flight.dec()
+            timings = stop_timings(timings_token)
+            timings["total"] = time.perf_counter() - start
 
-class RequestIdLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for CacheControl."""
+            observe_request(
+                scope["method"],
+                route_path(scope),
+                status_code,
+                timings["total"],
+            )
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        """Middleware Dispatcher."""
-        original_id = None  # Should be request.headers.get("X-Request-ID")
-        context.request_id = get_request_id(original_id)
+            if status_code >= 500 or random.random() < self.log_sample_rate:
+                self._log_request(scope, status_code, timings)
 
-        response = await call_next(request)
+            reset_current_request_id(request_id_token)
 
-        return response
+    def _log_request(
+        self, scope: Scope, status_code: int, timings: Dict[str, float]
+    ) -> None:
+        stages = " ".join(
+            f"{name}={seconds * 1000:.2f}ms"
+            for name, seconds in timings.items()
+        )
+        logging.info(
+            f"{scope['method']} {scope['path']} [{status_code}] {stages}",
+            extra={"timings": timings},
+        )
@@ -1,26 +1,79 @@
 import logging
-from typing import Dict, List
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 import pymongo
 from bson import ObjectId, errors
 from dotenv import load_dotenv
 from fastapi.exceptions import ValidationException
+from pymongo import IndexModel
 from pymongo.database import Database
+from pymongo.errors import OperationFailure
 
 from api.repositories.base import BaseRepository
-from api.schemas.stock import Stock
+from api.schemas.stock import Stock, StockSummary
+from api.utils.metrics import observe_count
+from api.utils.timing import stage
 
 load_dotenv()
 
+SORTABLE_FIELDS = [
+    field for field in Stock.fields() if field not in ("id", "summary")
+]
+
 
 class StockMetadataRepository(BaseRepository):
     """Stocks repository class."""
 
+    # Every sortable field is indexed together with `_id`, which is the
+    # listing tiebreaker, so sorted and keyset listings are index-backed in
+    # both directions.
+    INDEXES = [
+        IndexModel(
+            [("symbol", pymongo.ASCENDING)], name="symbol", unique=True
+        ),
+    ] + [
+        IndexModel(
+            [(field, pymongo.ASCENDING), ("_id", pymongo.ASCENDING)],
+            name=f"{field}__id",
+        )
+        for field in SORTABLE_FIELDS
+    ]
+
     def __init__(self, db: Database) -> None:
         super().__init__(db)
         self._collection_name = "stocks"
         self._stock_collection = db[self._collection_name]
 
+    def ensure_indexes(self) -> List[str]:
+        """Create the repository indexes that do not exist yet.
+
+        Creating an index that already exists is a no-op, so this is safe to
+        run on every startup. Returns the names of the indexes that could not
+        be created.
+        """
+        failed = []
+        for index in self.INDEXES:
+            try:
+                self._stock_collection.create_indexes([index])
+            except OperationFailure as e:
+                name = index.document["name"]
+                logging.error(f"Could not create index [{name}]. Error [{e}].")
+                failed.append(name)
+
+        return failed
+
+    def missing_indexes(self) -> List[str]:
+        """Return the sortable fields that no index starts with."""
+        indexed_fields = {
+            list(index["key"])[0][0]
+            for index in self._stock_collection.index_information().values()
+        }
+
+        return [
+            field for field in SORTABLE_FIELDS if field not in indexed_fields
+        ]
+
     def _create_stock_from_mongo(self, stock_dict: Dict) -> Stock:
         stock_dict["id"] = str(stock_dict["_id"])
 
@@ -35,6 +88,7 @@ class StockMetadataRepository(BaseRepository):
 
         return self.get_by_id(id=str(result.inserted_id))
 
+    @stage("mongo")
     def get_by_id(self, id: str) -> Stock:
         """List a Stock by id.
 
@@ -53,22 +107,129 @@ class StockMetadataRepository(BaseRepository):
 
         return None
 
+    @stage("mongo")
+    def update_summary(self, id: str, summary: StockSummary) -> None:
+        """Store the series summary of a Stock.
+
+        Parameters:
+        id (string): stock identifier.
+        summary (StockSummary): series summary statistics.
+        """
+        self._stock_collection.update_one(
+            {"_id": ObjectId(id)}, {"$set": {"summary": summary.model_dump()}}
+        )
+
+    def _record_count(self, strategy: str, start: float) -> None:
+        elapsed = time.perf_counter() - start
+        observe_count(strategy, elapsed)
+        logging.debug(
+            f"Counted stocks with strategy [{strategy}] "
+            f"in [{elapsed * 1000:.2f}ms]."
+        )
+
+    def count(self, exact: bool = False) -> int:
+        """Count stocks.
+
+        Counts use the collection metadata estimate, which is cheap but can
+        be stale, unless `exact`.
+
+        Parameters:
+        exact (bool): count the documents of the collection.
+        """
+        start = time.perf_counter()
+
+        if exact:
+            count = self._stock_collection.count_documents({})
+            self._record_count("exact", start)
+        else:
+            count = self._stock_collection.estimated_document_count()
+            self._record_count("estimated", start)
+
+        return count
+
+    def _keyset_filter(
+        self, sort: List[tuple], after: Tuple[Any, str]
+    ) -> Dict:
+        sort_field, sort_order = sort[0]
+        value, id = after
+
+        try:
+            after_id = ObjectId(id)
+        except (errors.InvalidId, TypeError):
+            raise ValidationException("The cursor id is not a valid ObjectId.")
+
+        ascending = sort_order == pymongo.ASCENDING
+        operator = "$gt" if ascending else "$lt"
+        conditions = [{sort_field: value, "_id": {operator: after_id}}]
+
+        # Nulls (and missing values) sort before any other value and are
+        # never matched by comparison operators, so every value follows a
+        # null in ascending order and nulls follow every value in
+        # descending order.
+        if value is None:
+            if ascending:
+                conditions.insert(0, {sort_field: {"$ne": None}})
+        else:
+            conditions.insert(0, {sort_field: {operator: value}})
+
+            if not ascending:
+                conditions.append({sort_field: None})
+
+        return {"$or": conditions}
+
+    @stage("mongo")
+    def list_by_ids(self, ids: List[str]) -> List[Stock]:
+        """List stocks by ids with a single query.
+
+        Parameters:
+        ids (list[str]): stock identifiers.
+        """
+        try:
+            object_ids = [ObjectId(id) for id in ids]
+        except errors.InvalidId:
+            raise ValidationException(
+                "The Ids entered are not valid ObjectIds."
+            )
+
+        docs = self._stock_collection.find({"_id": {"$in": object_ids}})
+
+        result = []
+        for doc in docs:
+            result.append(self._create_stock_from_mongo(doc))
+
+        return result
+
+    @stage("mongo")
     def list(
         self,
         skip: int,
         limit: int,
         sort: List[tuple],
-    ) -> List[Stock]:
+        after: Tuple[Any, str] = None,
+        include_total: bool = True,
+    ) -> Tuple[List[Stock], Optional[int]]:
         """List stocks by skip, limit and sort.
 
+        Documents are sorted by `_id` after `sort`, so pages are stable. When
+        `after` is given, the page is read with a keyset seek past that
+        document instead of skipping documents.
+
         Parameters:
         limit (int): limit of projects per page.
         skip (int): number of projects to skip.
         sort(List[tuple]): sort by
+        after (tuple): sort value and id of the last document of the
+        previous page.
+        include_total (bool): count the stocks, None is returned otherwise.
         """
-        count = self._stock_collection.count_documents({})
+        count = self.count() if include_total else None
+
+        # The estimate can be stale, so a skip past it is checked against
+        # the exact count before it is rejected.
+        if count is not None and skip > count:
+            count = self.count(exact=True)
 
-        if skip > count or skip < 0:
+        if skip < 0 or (count is not None and skip > count):
             logging.error(f"Invalid skip value [{skip}].")
             raise ValidationException("Invalid skip value.")
 
@@ -76,9 +237,21 @@ class StockMetadataRepository(BaseRepository):
             logging.error(f"Invalid limit value [{limit}].")
             raise ValidationException("Invalid limit value.")
 
-        docs = (
-            self._stock_collection.find({}).skip(skip).limit(limit).sort(sort)
-        )
+        keyset_sort = sort + [("_id", sort[0][1])]
+
+        if after is not None:
+            docs = (
+                self._stock_collection.find(self._keyset_filter(sort, after))
+                .limit(limit)
+                .sort(keyset_sort)
+            )
+        else:
+            docs = (
+                self._stock_collection.find({})
+                .skip(skip)
+                .limit(limit)
+                .sort(keyset_sort)
+            )
 
         result = []
         for doc in docs:
@@ -1,29 +1,226 @@
+import io
+import mmap
+import os
 import posixpath
+from concurrent.futures import Executor
+from datetime import datetime, timezone
 from io import BytesIO
+from typing import NamedTuple, Optional, Union
 
 from google.auth.credentials import AnonymousCredentials
-from google.cloud.storage import Client
+from google.cloud.storage import Blob, Client
 
+from api.utils.timing import stage
 
-class StockSeriesRepository(Client):
+
+class StockSeriesRepository:
     """Storage repository to handle general data from GCS."""
 
     def __init__(
-        self, bucket: str, blob_prefix: str, folder: str = "stocks"
+        self,
+        bucket: str,
+        blob_prefix: str,
+        folder: str = "stocks",
+        client: Client = None,
+        executor: Executor = None,
+        ranged_download_threshold: int = 8 * 1024 * 1024,
+        ranged_download_chunk_size: int = 2 * 1024 * 1024,
     ) -> None:
-        client_credentials = AnonymousCredentials()
-        super().__init__(credentials=client_credentials)
-        self._bucket = self.bucket(bucket)
+        if client is None:
+            client = Client(credentials=AnonymousCredentials())
+
+        self._client = client
+        self._bucket = client.bucket(bucket)
         self._folder = folder
         self._blob_prefix = blob_prefix
+        self._executor = executor
+        self._ranged_download_threshold = ranged_download_threshold
+        self._ranged_download_chunk_size = ranged_download_chunk_size
+
+    @stage("storage")
+    def get_blob(self, blob_name: str) -> Optional[Blob]:
+        """Get specified blob metadata, or None if it does not exist."""
+        blob_path = posixpath.join(self._blob_prefix, blob_name)
+
+        return self._bucket.get_blob(blob_path)
+
+    @stage("download")
+    def download_as_buffer(
+        self, blob_name: str, generation: int = None, size: int = None
+    ) -> BytesIO:
+        """Download specified blob as bytes.
 
-    def download_as_buffer(self, blob_name: str) -> BytesIO:
-        """Download specified blob as bytes."""
+        Blobs of a known `size` above the ranged download threshold are
+        fetched as byte ranges in parallel on the repository executor.
+
+        Parameters:
+        blob_name (str): blob name inside the repository prefix.
+        generation (int): blob generation to download, latest if not set.
+        size (int): blob size in bytes, if known.
+        """
         blob_path = posixpath.join(self._blob_prefix, blob_name)
-        blob = self._bucket.blob(blob_path)
+        blob = self._bucket.blob(blob_path, generation=generation)
+
+        if (
+            self._executor is not None
+            and size is not None
+            and size > self._ranged_download_threshold
+        ):
+            return self._download_ranges(blob, size)
 
         buffered_data = BytesIO()
         blob.download_to_file(buffered_data)
         buffered_data.seek(0)
 
         return buffered_data
+
+    def _download_range(self, blob: Blob, start: int, end: int) -> bytes:
+        # Checksums are only validated for whole objects.
+        return blob.download_as_bytes(start=start, end=end, checksum=None)
+
+    def _download_ranges(self, blob: Blob, size: int) -> BytesIO:
+        chunk_size = self._ranged_download_chunk_size
+        ranges = [
+            (start, min(start + chunk_size, size) - 1)
+            for start in range(0, size, chunk_size)
+        ]
+
+        buffered_data = BytesIO()
+        chunks = self._executor.map(
+            lambda byte_range: self._download_range(blob, *byte_range),
+            ranges,
+        )
+        for chunk in chunks:
+            buffered_data.write(chunk)
+        buffered_data.seek(0)
+
+        return buffered_data
+
+
+class FileBlob(NamedTuple):
+    """Metadata of a series file, with the Blob attributes the api reads."""
+
+    name: str
+    generation: int
+    size: int
+    updated: datetime
+    md5_hash: Optional[str] = None
+    etag: Optional[str] = None
+
+
+class MappedFile(io.RawIOBase):
+    """Read-only file object over a memory-mapped file.
+
+    Reads copy straight from the mapping, and `getbuffer` exposes the
+    mapped bytes without copying them, like `io.BytesIO.getbuffer`. The
+    mapping is released on close, or once the last buffer exported by
+    `getbuffer` is released.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as mapped_file:
+            self._size = os.fstat(mapped_file.fileno()).st_size
+            # Empty files can not be mapped.
+            self._data: Union[mmap.mmap, bytes] = (
+                mmap.mmap(mapped_file.fileno(), 0, access=mmap.ACCESS_READ)
+                if self._size
+                else b""
+            )
+
+        self._position = 0
+
+    def readable(self) -> bool:
+        """Return True, mapped files are readable."""
+        return True
+
+    def seekable(self) -> bool:
+        """Return True, mapped files are seekable."""
+        return True
+
+    def tell(self) -> int:
+        """Return the current position."""
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Change the current position."""
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._size
+
+        self._position = max(0, offset)
+
+        return self._position
+
+    def readinto(self, buffer: Union[bytearray, memoryview]) -> int:
+        """Read bytes from the mapping into a pre-allocated buffer."""
+        start = min(self._position, self._size)
+        end = min(start + len(buffer), self._size)
+
+        with memoryview(self._data) as view, memoryview(buffer) as target:
+            target.cast("B")[: end - start] = view[start:end]
+
+        self._position = end
+
+        return end - start
+
+    def getbuffer(self) -> memoryview:
+        """Return a read-only view of the mapped bytes, without copying."""
+        return memoryview(self._data)
+
+    def close(self) -> None:
+        """Close the file, and the mapping if no buffer is exported."""
+        if isinstance(self._data, mmap.mmap):
+            try:
+                self._data.close()
+            except BufferError:
+                # Views returned by getbuffer are alive, the mapping is
+                # released with the last of them.
+                pass
+
+        super().close()
+
+
+class FileSystemStockSeriesRepository(StockSeriesRepository):
+    """Storage repository that serves series from a local directory.
+
+    The directory is laid out like the stocks bucket (e.g.
+    `<root>/csv/NTPC.csv`), and series are memory-mapped instead of copied
+    into a buffer. The file modification time is used as blob generation.
+    """
+
+    def __init__(self, root: str, blob_prefix: str) -> None:
+        self._root = root
+        self._blob_prefix = blob_prefix
+
+    def _path(self, blob_name: str) -> str:
+        return os.path.join(self._root, self._blob_prefix, blob_name)
+
+    @stage("storage")
+    def get_blob(self, blob_name: str) -> Optional[FileBlob]:
+        """Get specified file metadata, or None if it does not exist."""
+        try:
+            stat = os.stat(self._path(blob_name))
+        except FileNotFoundError:
+            return None
+
+        return FileBlob(
+            name=posixpath.join(self._blob_prefix, blob_name),
+            generation=stat.st_mtime_ns,
+            size=stat.st_size,
+            updated=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+            etag=str(stat.st_mtime_ns),
+        )
+
+    @stage("download")
+    def download_as_buffer(
+        self, blob_name: str, generation: int = None, size: int = None
+    ) -> MappedFile:
+        """Memory-map specified file.
+
+        Parameters:
+        blob_name (str): file name inside the repository prefix.
+        generation (int): unused, the current file is always mapped.
+        size (int): unused.
+        """
+        return MappedFile(self._path(blob_name))
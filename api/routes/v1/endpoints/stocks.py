@@ -1,18 +1,68 @@
-from fastapi import APIRouter, Depends
+from datetime import date
+from typing import List
+
+from fastapi import APIRouter, Depends, Request, Response
 from fastapi.params import Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
+from api.config.settings import Settings, get_settings
 from api.dependencies.depends import get_service
-from api.schemas.stock import StockListing, StockResponse
+from api.schemas.stock import (
+    AggregationInterval,
+    StockAggregateResponse,
+    StockBatchResponse,
+    StockListing,
+    StockResponse,
+)
+from api.services.encoders import (
+    ARROW_STREAM_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    iter_ndjson_frames,
+)
 from api.services.stocks import StockService
+from api.utils import api_errors
+from api.utils.content_negotiation import negotiate_media_type
+from api.utils.http_cache import (
+    cache_headers,
+    is_not_modified,
+    series_etag,
+    series_last_modified,
+)
+from api.utils.responses import (
+    StockSeriesArrowResponse,
+    StockSeriesBatchJSONResponse,
+    StockSeriesJSONResponse,
+    StockSeriesMsgPackResponse,
+)
+from api.utils.timing import stage
 
 router = APIRouter()
 
+JSON_MEDIA_TYPE = "application/json"
+
+SERIES_MEDIA_TYPES = [
+    JSON_MEDIA_TYPE,
+    ARROW_STREAM_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+]
+
+SERIES_RESPONSE_CLASSES = {
+    JSON_MEDIA_TYPE: StockSeriesJSONResponse,
+    ARROW_STREAM_MEDIA_TYPE: StockSeriesArrowResponse,
+    MSGPACK_MEDIA_TYPE: StockSeriesMsgPackResponse,
+}
 
-@router.get("")
+
+@router.get("", response_model_exclude_unset=True)
 async def list_metadata(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=0, le=100),
     sort: str = Query("company_name", max_length=50),
+    cursor: str = Query(None, max_length=1000),
+    include_total: bool = Query(True),
     stocks_service: StockService = Depends(get_service(StockService)),
 ) -> StockListing:
     """Get a stock by id.
@@ -21,21 +71,215 @@ async def list_metadata(
     **skip (int)**: documents to skip
     **limit (int)**: documents limit
     **sort (str)**: field to sort (asc: company_name, desc: -company_name)
+    **cursor (str)**: `next_cursor` of the previous page, instead of skip
+    **include_total (bool)**: count all stocks, `total` is null otherwise
+
+    Stocks include their precomputed series `summary` (last close, 52 weeks
+    high, low and average volume) once it has been computed by
+    `python -m api.commands.summaries`.
     """
-    stocks, total = stocks_service.list(skip, limit, sort)
+    stocks, total, next_cursor = await stocks_service.list(
+        skip, limit, sort, cursor=cursor, include_total=include_total
+    )
+
+    return StockListing(
+        stocks=stocks,
+        skip=skip,
+        limit=limit,
+        total=total,
+        next_cursor=next_cursor,
+    )
+
+
+def _split_query_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+@router.get(
+    "/series",
+    response_model=StockBatchResponse,
+    response_class=StockSeriesBatchJSONResponse,
+)
+async def get_many(
+    ids: str = Query(..., max_length=2500),
+    start: date = Query(None),
+    end: date = Query(None),
+    fields: str = Query(None, max_length=250),
+    stocks_service: StockService = Depends(get_service(StockService)),
+    settings: Settings = Depends(get_settings),
+) -> StockBatchResponse:
+    """Get many stocks with their time series by ids.
+
+    Query parameters:
+    **ids (str)**: comma separated stock ids
+    **start (date)**: first date of the series, inclusive
+    **end (date)**: last date of the series, inclusive
+    **fields (str)**: comma separated series columns (e.g. open,close)
+    """
+    stock_ids = _split_query_list(ids)
+
+    if not stock_ids or len(stock_ids) > settings.SERIES_BATCH_MAX_IDS:
+        api_errors.raise_error_response(
+            api_errors.ErrorInvalidQueryParameters,
+            detail="Query parameter 'ids' must have between 1 and "
+            f"{settings.SERIES_BATCH_MAX_IDS} ids.",
+        )
+
+    series_fields = _split_query_list(fields) if fields else None
+
+    series, not_found = await stocks_service.get_many(
+        stock_ids, start=start, end=end, fields=series_fields
+    )
+
+    with stage("encoding"):
+        return await run_in_threadpool(
+            StockSeriesBatchJSONResponse, (series, not_found)
+        )
+
+
+def _series_media_type(request: Request, stream: bool) -> str:
+    """Negotiate the media type of a stock series response.
+
+    JSON is returned when the request accepts none of the series media
+    types.
+    """
+    if stream:
+        return NDJSON_MEDIA_TYPE
+
+    media_type = negotiate_media_type(
+        request.headers.get("accept"), SERIES_MEDIA_TYPES
+    )
 
-    return StockListing(stocks=stocks, skip=skip, limit=limit, total=total)
+    return media_type or JSON_MEDIA_TYPE
 
 
-@router.get("/{id}")
+@router.get(
+    "/{id}",
+    response_model_exclude_unset=True,
+    response_class=StockSeriesJSONResponse,
+    responses={
+        200: {
+            "content": {
+                NDJSON_MEDIA_TYPE: {},
+                ARROW_STREAM_MEDIA_TYPE: {},
+                MSGPACK_MEDIA_TYPE: {},
+            }
+        }
+    },
+)
 async def get(
-    id: str, stocks_service: StockService = Depends(get_service(StockService))
+    request: Request,
+    id: str,
+    start: date = Query(None),
+    end: date = Query(None),
+    fields: str = Query(None, max_length=250),
+    stream: bool = Query(False),
+    stocks_service: StockService = Depends(get_service(StockService)),
 ) -> StockResponse:
     """Get a stock with its time series by id.
 
+    The series is streamed as newline delimited JSON rows when `stream` is
+    set or the request accepts `application/x-ndjson`. csv and parquet
+    series are parsed and streamed chunk by chunk, json and xlsx series can
+    not be parsed in chunks and are parsed whole before being streamed, and
+    the series file is always downloaded whole. Requests accepting
+    `application/vnd.apache.arrow.stream` get an Arrow IPC stream and
+    requests accepting `application/msgpack` get MessagePack with the series
+    columns as typed binary buffers.
+
+    Path parameters:
+    **id (str)**: stock id
+
+    Query parameters:
+    **start (date)**: first date of the series, inclusive
+    **end (date)**: last date of the series, inclusive
+    **fields (str)**: comma separated series columns (e.g. open,close)
+    **stream (bool)**: stream the series as newline delimited JSON rows
+
+    Responses carry ETag and Last-Modified headers, and conditional requests
+    (If-None-Match, If-Modified-Since) for an unchanged series are answered
+    with 304 Not Modified without downloading the series.
+    """
+    series_fields = _split_query_list(fields) if fields else None
+    media_type = _series_media_type(request, stream)
+
+    stock, blob = await stocks_service.get_series_metadata(id)
+
+    etag = series_etag(
+        stock,
+        blob,
+        (
+            media_type,
+            start,
+            end,
+            ",".join(series_fields or []),
+        ),
+    )
+    last_modified = series_last_modified(stock, blob)
+    headers = {**cache_headers(etag, last_modified), "Vary": "Accept"}
+
+    if is_not_modified(request.headers, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+
+    if media_type == NDJSON_MEDIA_TYPE:
+        stock, frames = await stocks_service.iter_dataframe(
+            id,
+            start=start,
+            end=end,
+            fields=series_fields,
+            series_metadata=(stock, blob),
+        )
+
+        # The series is parsed and encoded chunk by chunk, in the
+        # threadpool, while the response is streamed.
+        return StreamingResponse(
+            iter_ndjson_frames(frames),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers=headers,
+        )
+
+    stock, data = await stocks_service.get_dataframe(
+        id,
+        start=start,
+        end=end,
+        fields=series_fields,
+        series_metadata=(stock, blob),
+    )
+
+    # Encoding is CPU bound, so the response is rendered off the event loop.
+    with stage("encoding"):
+        response = await run_in_threadpool(
+            SERIES_RESPONSE_CLASSES[media_type], (stock, data)
+        )
+    response.headers.update(headers)
+
+    return response
+
+
+@router.get("/{id}/aggregate", response_model_exclude_unset=True)
+async def aggregate(
+    id: str,
+    interval: AggregationInterval = Query(...),
+    start: date = Query(None),
+    end: date = Query(None),
+    stocks_service: StockService = Depends(get_service(StockService)),
+) -> StockAggregateResponse:
+    """Get a stock with its OHLCV time series aggregated by interval.
+
     Path parameters:
     **id (str)**: stock id
+
+    Query parameters:
+    **interval (str)**: W (weekly), M (monthly), Q (quarterly), Y (yearly)
+    **start (date)**: first date of the series, inclusive
+    **end (date)**: last date of the series, inclusive
     """
-    stock, stock_time_series = stocks_service.get(id)
+    stock, stock_time_series = await stocks_service.aggregate(
+        id, interval, start=start, end=end
+    )
 
-    return StockResponse(**stock.model_dump(), time_series=stock_time_series)
+    return StockAggregateResponse(
+        **stock.model_dump(),
+        interval=interval,
+        time_series=stock_time_series,
+    )
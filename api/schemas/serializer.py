@@ -7,3 +7,4 @@ class SerializerType(str, Enum):
     JSON = "json"
     CSV = "csv"
     EXCEL = "xlsx"
+    PARQUET = "parquet"
@@ -24,6 +24,44 @@ STOCK_SERIES_COLUMNS_RENAMER = {
     "%Deliverble": "deliverable_percent",
 }
 
+STOCK_SERIES_INTEGER_COLUMNS = ["volume", "deliverable_volume"]
+STOCK_SERIES_STRING_COLUMNS = ["symbol", "series"]
+
+# Parsing schema of the series columns, by target column name. Columns that
+# can have missing values (e.g. deliverable_volume) are read as floats.
+STOCK_SERIES_DATE_COLUMNS = ["date"]
+STOCK_SERIES_COLUMNS_DTYPES = {
+    "symbol": "object",
+    "series": "object",
+    "previous_close": "float64",
+    "open": "float64",
+    "high": "float64",
+    "low": "float64",
+    "last": "float64",
+    "close": "float64",
+    "vwap": "float64",
+    "volume": "int64",
+    "turnover": "float64",
+    "trades": "float64",
+    "deliverable_volume": "float64",
+    "deliverable_percent": "float64",
+}
+STOCK_SERIES_DATE_FORMAT = "%Y-%m-%d"
+
+
+class StockSummary(BaseModel):
+    """Stock series summary statistics representation.
+
+    Statistics are computed over the 52 weeks up to the last observation of
+    the series (`as_of`).
+    """
+
+    as_of: datetime
+    last_close: Optional[float] = None
+    high_52_weeks: Optional[float] = None
+    low_52_weeks: Optional[float] = None
+    average_volume_52_weeks: Optional[float] = None
+
 
 class Stock(BaseModel):
     """Stock representation."""
@@ -37,6 +75,7 @@ class Stock(BaseModel):
     file_format: str
     created_at: Optional[datetime]
     last_updated: Optional[datetime]
+    summary: Optional[StockSummary] = None
 
     @classmethod
     def from_dict(cls, data: Dict):  # noqa
@@ -49,24 +88,37 @@ class Stock(BaseModel):
         return list(cls.model_fields.keys())
 
 
+class AggregationInterval(str, Enum):
+    """Time series aggregation interval enumerator."""
+
+    WEEK = "W"
+    MONTH = "M"
+    QUARTER = "Q"
+    YEAR = "Y"
+
+
 class StockSeries(BaseModel):
-    """Stock observation representation."""
+    """Stock observation representation.
+
+    Every column but `date` is optional, so a series can be projected to a
+    subset of columns.
+    """
 
     date: List[datetime]
-    symbol: List[Union[str, None]]
-    series: List[Union[str, None]]
-    previous_close: List[Union[float, None]]
-    open: List[Union[float, None]]
-    high: List[Union[float, None]]
-    low: List[Union[float, None]]
-    last: List[Union[float, None]]
-    close: List[Union[float, None]]
-    vwap: List[Union[float, None]]
-    volume: List[Union[int, None]]
-    turnover: List[Union[float, None]]
-    trades: List[Union[float, None]]
-    deliverable_volume: List[Union[int, None]]
-    deliverable_percent: List[Union[float, None]]
+    symbol: Optional[List[Union[str, None]]] = None
+    series: Optional[List[Union[str, None]]] = None
+    previous_close: Optional[List[Union[float, None]]] = None
+    open: Optional[List[Union[float, None]]] = None
+    high: Optional[List[Union[float, None]]] = None
+    low: Optional[List[Union[float, None]]] = None
+    last: Optional[List[Union[float, None]]] = None
+    close: Optional[List[Union[float, None]]] = None
+    vwap: Optional[List[Union[float, None]]] = None
+    volume: Optional[List[Union[int, None]]] = None
+    turnover: Optional[List[Union[float, None]]] = None
+    trades: Optional[List[Union[float, None]]] = None
+    deliverable_volume: Optional[List[Union[int, None]]] = None
+    deliverable_percent: Optional[List[Union[float, None]]] = None
 
     @classmethod
     def from_dataframe(cls, data: pd.DataFrame):  # noqa
@@ -74,6 +126,35 @@ class StockSeries(BaseModel):
         data["date"] = pd.to_datetime(data["date"])
         return StockSeries(**data.to_dict(orient="list"))
 
+    @classmethod
+    def fields(cls) -> List[str]:
+        """Return all fields from StockSeries base model."""
+        return list(cls.model_fields.keys())
+
+
+class StockAggregateSeries(BaseModel):
+    """Aggregated stock OHLCV representation."""
+
+    date: List[datetime]
+    open: Optional[List[Union[float, None]]] = None
+    high: Optional[List[Union[float, None]]] = None
+    low: Optional[List[Union[float, None]]] = None
+    close: Optional[List[Union[float, None]]] = None
+    volume: Optional[List[Union[int, None]]] = None
+    vwap: Optional[List[Union[float, None]]] = None
+    turnover: Optional[List[Union[float, None]]] = None
+
+    @classmethod
+    def from_dataframe(cls, data: pd.DataFrame):  # noqa
+        data = data.replace({nan: None})
+        data["date"] = pd.to_datetime(data["date"])
+        return StockAggregateSeries(**data.to_dict(orient="list"))
+
+    @classmethod
+    def fields(cls) -> List[str]:
+        """Return all fields from StockAggregateSeries base model."""
+        return list(cls.model_fields.keys())
+
 
 class StockResponse(BaseModel):
     """Stock response representation."""
@@ -89,13 +170,36 @@ class StockResponse(BaseModel):
     time_series: StockSeries
 
 
+class StockBatchResponse(BaseModel):
+    """Many stocks with their series response representation."""
+
+    stocks: Dict[str, StockResponse]
+    not_found: List[str]
+
+
+class StockAggregateResponse(BaseModel):
+    """Stock aggregated series response representation."""
+
+    company_name: str
+    industry: str
+    symbol: str
+    series: str
+    isin_code: str
+    file_format: str
+    created_at: datetime
+    last_updated: datetime
+    interval: AggregationInterval
+    time_series: StockAggregateSeries
+
+
 class StockListing(BaseModel):
     """Stock representation."""
 
     stocks: List[Stock]
     skip: int
     limit: int
-    total: int
+    total: Optional[int]
+    next_cursor: Optional[str] = None
 
 
 class StockFileType(str, Enum):
@@ -104,3 +208,4 @@ class StockFileType(str, Enum):
     EXCEL = "xlsx"
     CSV = "csv"
     JSON = "json"
+    PARQUET = "parquet"
@@ -0,0 +1,178 @@
+import glob
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+
+class SeriesCacheKey(NamedTuple):
+    """Key that identifies a parsed stock series."""
+
+    symbol: str
+    file_format: str
+    generation: Optional[int]
+
+
+class SeriesCache:
+    """Bounded LRU cache of parsed stock series.
+
+    Entries are evicted in least recently used order once the estimated
+    memory of the cached DataFrames goes over `max_bytes`. Cached frames are
+    shared between requests and must be treated as read-only.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict = OrderedDict()
+        self._latest_keys: Dict[tuple, SeriesCacheKey] = {}
+        self._lock = threading.Lock()
+        self._size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _evict(self, key: SeriesCacheKey) -> None:
+        _, nbytes = self._entries.pop(key)
+        self._size -= nbytes
+
+        if self._latest_keys.get(key[:2]) == key:
+            del self._latest_keys[key[:2]]
+
+    def get(self, key: SeriesCacheKey) -> Optional[pd.DataFrame]:
+        """Get a cached series, marking it as most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return entry[0]
+
+    def put(self, key: SeriesCacheKey, data: pd.DataFrame) -> None:
+        """Cache a series, evicting older entries to fit the memory budget.
+
+        A series that does not fit the budget on its own is not cached.
+        """
+        nbytes = int(data.memory_usage(index=True, deep=True).sum())
+
+        if nbytes > self._max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._evict(key)
+
+            # A new generation of the same blob supersedes the old one.
+            stale_key = self._latest_keys.get(key[:2])
+            if stale_key is not None and stale_key in self._entries:
+                self._evict(stale_key)
+
+            while self._entries and self._size + nbytes > self._max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._evict(oldest_key)
+                self.evictions += 1
+
+            self._entries[key] = (data, nbytes)
+            self._latest_keys[key[:2]] = key
+            self._size += nbytes
+
+    def clear(self) -> None:
+        """Remove all cached series."""
+        with self._lock:
+            self._entries.clear()
+            self._latest_keys.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "max_bytes": self._max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class SeriesSidecarCache:
+    """Local disk cache of parsed stock series, stored as parquet.
+
+    Sidecars are keyed by blob generation, so a new generation of a blob
+    never reads a stale sidecar and replaces the sidecars of older ones.
+    Sidecars are written to a temporary file and renamed, so concurrent
+    readers and writers never see a partial file.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self._directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: SeriesCacheKey) -> str:
+        symbol, file_format, generation = key
+        return os.path.join(
+            self._directory, f"{symbol}.{file_format}.{generation}.parquet"
+        )
+
+    def get(
+        self, key: SeriesCacheKey, columns: List[str] = None
+    ) -> Optional[pd.DataFrame]:
+        """Read a series sidecar, projected to `columns` when provided."""
+        if key.generation is None:
+            return None
+
+        try:
+            return pd.read_parquet(
+                self._path(key), engine="pyarrow", columns=columns
+            )
+        except FileNotFoundError:
+            return None
+        except (pa.ArrowException, OSError) as e:
+            logging.warning(f"Could not read sidecar [{key}]. Error [{e}].")
+            return None
+
+    def put(self, key: SeriesCacheKey, data: pd.DataFrame) -> None:
+        """Write a series sidecar and remove the ones of older generations."""
+        if key.generation is None:
+            return
+
+        path = self._path(key)
+        symbol, file_format, _ = key
+
+        temp_path = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                dir=self._directory, suffix=".tmp", delete=False
+            ) as sidecar_file:
+                temp_path = sidecar_file.name
+                data.to_parquet(sidecar_file, engine="pyarrow", index=False)
+
+            os.replace(temp_path, path)
+        except (pa.ArrowException, OSError, ValueError) as e:
+            logging.warning(f"Could not write sidecar [{key}]. Error [{e}].")
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+
+        pattern = os.path.join(
+            self._directory, f"{glob.escape(symbol)}.{file_format}.*.parquet"
+        )
+        for stale_path in glob.glob(pattern):
+            if stale_path == path:
+                continue
+
+            try:
+                os.remove(stale_path)
+            except FileNotFoundError:
+                pass
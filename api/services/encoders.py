@@ -0,0 +1,235 @@
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+import msgpack
+import numpy as np
+import orjson
+import pandas as pd
+import pyarrow as pa
+
+from api.schemas.stock import (
+    STOCK_SERIES_INTEGER_COLUMNS,
+    STOCK_SERIES_STRING_COLUMNS,
+    Stock,
+    StockResponse,
+    StockSeries,
+)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+NDJSON_CHUNK_ROWS = 1000
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+def _series_columns(data: pd.DataFrame) -> List[str]:
+    return [column for column in StockSeries.fields() if column in data]
+
+
+def _column_values(data: pd.DataFrame, column: str) -> List:
+    """Convert a series column to JSON ready Python values.
+
+    Dates become ISO strings, integer columns stored as floats because of
+    missing values become ints and NaN becomes None.
+    """
+    values = data[column]
+
+    if column == "date":
+        return pd.to_datetime(values).dt.strftime(DATE_FORMAT).tolist()
+
+    if column in STOCK_SERIES_INTEGER_COLUMNS and values.dtype.kind == "f":
+        values = values.astype("Int64")
+
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+def iter_ndjson(
+    data: pd.DataFrame, chunk_rows: int = NDJSON_CHUNK_ROWS
+) -> Iterator[bytes]:
+    """Encode a series DataFrame as newline delimited JSON rows.
+
+    Rows are encoded and yielded in chunks of `chunk_rows`, so only one
+    chunk of Python objects is alive at a time.
+    """
+    columns = _series_columns(data)
+
+    for start in range(0, len(data), chunk_rows):
+        end = start + chunk_rows
+        chunk = data.iloc[start:end]
+        chunk_values: Dict[str, List] = {
+            column: _column_values(chunk, column) for column in columns
+        }
+
+        yield b"".join(
+            orjson.dumps(
+                dict(zip(columns, row)), option=orjson.OPT_APPEND_NEWLINE
+            )
+            for row in zip(*chunk_values.values())
+        )
+
+
+def iter_ndjson_frames(
+    frames: Iterable[pd.DataFrame], chunk_rows: int = NDJSON_CHUNK_ROWS
+) -> Iterator[bytes]:
+    """Encode series DataFrame chunks as newline delimited JSON rows.
+
+    Every DataFrame is encoded as it is taken from `frames`, so a series
+    parsed in chunks is streamed without being held in memory at once.
+    """
+    for frame in frames:
+        yield from iter_ndjson(frame, chunk_rows)
+
+
+def _column_array(data: pd.DataFrame, column: str) -> Union[np.ndarray, List]:
+    """Convert a series column to an array orjson can encode natively.
+
+    Numeric and date columns are handed over as contiguous NumPy arrays, so
+    orjson writes them without creating a Python object per element (NaN is
+    written as null). String columns and integer columns with missing values
+    fall back to Python lists.
+    """
+    values = data[column]
+
+    if column == "date":
+        dates = pd.to_datetime(values).to_numpy(dtype="datetime64[ns]")
+        return np.ascontiguousarray(dates)
+
+    if column in STOCK_SERIES_STRING_COLUMNS:
+        return _column_values(data, column)
+
+    if column in STOCK_SERIES_INTEGER_COLUMNS:
+        if values.dtype.kind in "iu":
+            return np.ascontiguousarray(values.to_numpy(dtype="int64"))
+
+        return _column_values(data, column)
+
+    return np.ascontiguousarray(values.to_numpy(dtype="float64"))
+
+
+def _stock_metadata(stock: Stock) -> Dict:
+    response_fields = set(StockResponse.model_fields) - {"time_series"}
+    return stock.model_dump(mode="json", include=response_fields)
+
+
+def _stock_content(stock: Stock, data: pd.DataFrame) -> Dict:
+    content = _stock_metadata(stock)
+
+    content["time_series"] = {
+        column: _column_array(data, column) for column in _series_columns(data)
+    }
+
+    return content
+
+
+def encode_stock_series(stock: Stock, data: pd.DataFrame) -> bytes:
+    """Encode a stock and its series DataFrame as a StockResponse JSON.
+
+    This is a trusted fast path: the series columns are not validated by
+    pydantic, they are encoded straight from the DataFrame columns.
+    """
+    return orjson.dumps(
+        _stock_content(stock, data), option=orjson.OPT_SERIALIZE_NUMPY
+    )
+
+
+def encode_stock_series_batch(
+    series: Dict[str, Tuple[Stock, pd.DataFrame]], not_found: List[str]
+) -> bytes:
+    """Encode stocks and their series as a StockBatchResponse JSON."""
+    content = {
+        "stocks": {
+            id: _stock_content(stock, data)
+            for id, (stock, data) in series.items()
+        },
+        "not_found": not_found,
+    }
+
+    return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _arrow_column(data: pd.DataFrame, column: str) -> pa.Array:
+    """Convert a series column to an Arrow array of the column type.
+
+    Types come from the column, not from the values, so they do not change
+    between file formats or for an empty series: dates are nanosecond
+    timestamps, integer columns are int64 with nulls for missing values,
+    string columns are strings and other columns are doubles.
+    """
+    values = data[column]
+
+    if column == "date":
+        return pa.array(pd.to_datetime(values), type=pa.timestamp("ns"))
+
+    if column in STOCK_SERIES_STRING_COLUMNS:
+        arrow_type = pa.string()
+    elif column in STOCK_SERIES_INTEGER_COLUMNS:
+        arrow_type = pa.int64()
+    else:
+        arrow_type = pa.float64()
+
+    return pa.array(values, type=arrow_type, from_pandas=True)
+
+
+def encode_stock_series_arrow(stock: Stock, data: pd.DataFrame) -> bytes:
+    """Encode a stock series DataFrame as an Arrow IPC stream.
+
+    The series columns are written as typed Arrow columns, dates as
+    timestamps, and the stock metadata is stored as JSON in the `stock` key
+    of the schema metadata.
+    """
+    columns = _series_columns(data)
+
+    table = pa.Table.from_arrays(
+        [_arrow_column(data, column) for column in columns],
+        names=columns,
+    )
+    table = table.replace_schema_metadata(
+        {"stock": orjson.dumps(_stock_metadata(stock))}
+    )
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    return sink.getvalue().to_pybytes()
+
+
+def _column_buffer(data: pd.DataFrame, column: str) -> Union[Dict, List]:
+    """Convert a series column to a typed binary buffer.
+
+    Buffers are {"dtype", "data"} maps, where `dtype` is a NumPy type string
+    (e.g. "<f8") and `data` the raw little-endian column values. Dates are
+    nanoseconds since epoch ("<M8[ns]"), integer columns with missing values
+    are sent as floats with NaN and string columns as lists.
+    """
+    if column in STOCK_SERIES_STRING_COLUMNS:
+        return _column_values(data, column)
+
+    values = data[column]
+
+    if column == "date":
+        array = pd.to_datetime(values).to_numpy(dtype="datetime64[ns]")
+    elif column in STOCK_SERIES_INTEGER_COLUMNS and values.dtype.kind in "iu":
+        array = values.to_numpy(dtype="<i8")
+    else:
+        array = values.to_numpy(dtype="<f8")
+
+    array = np.ascontiguousarray(array)
+
+    return {"dtype": array.dtype.str, "data": array.tobytes()}
+
+
+def encode_stock_series_msgpack(stock: Stock, data: pd.DataFrame) -> bytes:
+    """Encode a stock and its series DataFrame as MessagePack.
+
+    The payload has the StockResponse layout, with every numeric and date
+    column of `time_series` sent as a typed binary buffer, so clients can
+    load it with `numpy.frombuffer` instead of decoding a list of floats.
+    """
+    content = _stock_metadata(stock)
+    content["time_series"] = {
+        column: _column_buffer(data, column)
+        for column in _series_columns(data)
+    }
+
+    return msgpack.packb(content, use_bin_type=True)
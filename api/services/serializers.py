@@ -1,31 +1,199 @@
 import io
-import json
-from typing import Dict
+from typing import Dict, Iterator, List, Union
 
+import numpy as np
+import orjson
 import pandas as pd
+import pyarrow.parquet as pq
+from pandas.api.types import is_integer_dtype
 
 from api.schemas.serializer import SerializerType
+from api.schemas.stock import (
+    STOCK_SERIES_COLUMNS_DTYPES,
+    STOCK_SERIES_DATE_COLUMNS,
+    STOCK_SERIES_DATE_FORMAT,
+)
+
+CHUNK_ROWS = 10000
 
 
 class Serializer:
     """Serializer service base class."""
 
     def serialize(
-        self, data: io.BytesIO, columns_renamer: Dict = None
+        self,
+        data: io.BytesIO,
+        columns_renamer: Dict = None,
+        columns: List[str] = None,
     ) -> pd.DataFrame:
-        """Serialize incoming buffered data to a pandas DataFrame."""
+        """Serialize incoming buffered data to a pandas DataFrame.
+
+        Parameters:
+        data (io.BytesIO): buffered data.
+        columns_renamer (dict): source to target column names.
+        columns (list[str]): target columns to read, all if not set.
+        """
         raise NotImplementedError()
 
+    def iter_serialize(
+        self,
+        data: io.BytesIO,
+        columns_renamer: Dict = None,
+        columns: List[str] = None,
+        chunk_rows: int = CHUNK_ROWS,
+    ) -> Iterator[pd.DataFrame]:
+        """Serialize incoming buffered data to pandas DataFrame chunks.
+
+        Formats that can not be read in chunks yield a single DataFrame.
+
+        Parameters:
+        data (io.BytesIO): buffered data.
+        columns_renamer (dict): source to target column names.
+        columns (list[str]): target columns to read, all if not set.
+        chunk_rows (int): maximum rows of a chunk.
+        """
+        yield self.serialize(data, columns_renamer, columns=columns)
+
+    def _source_columns(
+        self, columns: List[str], columns_renamer: Dict = None
+    ) -> List[str]:
+        """Map target column names back to the source column names."""
+        if not columns_renamer:
+            return list(columns)
+
+        source_names = {
+            target: source for source, target in columns_renamer.items()
+        }
+
+        return [source_names.get(column, column) for column in columns]
+
+    def _schema_dtypes(self, dataframe: pd.DataFrame) -> Dict[str, str]:
+        """Get the casts of renamed series columns to the series schema.
+
+        Columns that already have the schema dtype are left untouched.
+        Integer columns with missing values are cast to floats instead.
+        """
+        dtypes = {}
+        for column, dtype in STOCK_SERIES_COLUMNS_DTYPES.items():
+            if column not in dataframe:
+                continue
+
+            if is_integer_dtype(dtype) and dataframe[column].hasnans:
+                dtype = "float64"
+
+            if dataframe[column].dtype != dtype:
+                dtypes[column] = dtype
+
+        return dtypes
+
+    def _apply_schema(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """Cast renamed series columns to the dtypes of the series schema."""
+        dtypes = self._schema_dtypes(dataframe)
+        if dtypes:
+            dataframe = dataframe.astype(dtypes)
+
+        for column in STOCK_SERIES_DATE_COLUMNS:
+            if column in dataframe:
+                dataframe[column] = pd.to_datetime(
+                    dataframe[column], format=STOCK_SERIES_DATE_FORMAT
+                )
+
+        return dataframe
+
 
 class JsonSerializer(Serializer):
-    """Serializer class for json."""
+    """Serializer class for json.
+
+    Reads column oriented json ({column: {index: value}} or
+    {column: [values]}) and record oriented json ([{column: value}]).
+    Values are decoded with orjson and copied once into typed columns with
+    the dtypes of the series schema.
+    """
+
+    def _column_values(
+        self, json_data: Union[Dict, List], column: str, index: List
+    ) -> List:
+        """Get the values of a column of column or record oriented json.
+
+        Columns keyed by index are aligned to `index`, the index of the
+        first column.
+        """
+        if isinstance(json_data, list):
+            return [record.get(column) for record in json_data]
+
+        values = json_data[column]
+        if not isinstance(values, dict):
+            return values
+
+        if list(values) == index:
+            return list(values.values())
+
+        return [values.get(key) for key in index]
+
+    def _index(self, json_data: Union[Dict, List]) -> List:
+        """Get the index of the first column of column oriented json."""
+        if isinstance(json_data, dict):
+            first_column = next(iter(json_data.values()), [])
+            if isinstance(first_column, dict):
+                return list(first_column)
+
+        return []
+
+    def _typed_column(
+        self, values: List, column: str, columns_renamer: Dict = None
+    ) -> Union[np.ndarray, pd.Series]:
+        """Convert column values to the dtype of the series schema."""
+        if columns_renamer:
+            column = columns_renamer.get(column, column)
+
+        if column in STOCK_SERIES_DATE_COLUMNS:
+            try:
+                # NumPy parses ISO 8601 dates much faster than pandas.
+                return np.asarray(values, dtype="datetime64[ns]")
+            except ValueError:
+                return pd.to_datetime(values, format=STOCK_SERIES_DATE_FORMAT)
+
+        dtype = STOCK_SERIES_COLUMNS_DTYPES.get(column)
+        if dtype is None:
+            return pd.Series(values)
+
+        try:
+            return np.asarray(values, dtype=dtype)
+        except (TypeError, ValueError):
+            # Integer columns with missing values are read as floats.
+            return np.asarray(values, dtype="float64")
 
     def serialize(
-        self, data: io.BytesIO, columns_renamer: Dict = None
+        self,
+        data: io.BytesIO,
+        columns_renamer: Dict = None,
+        columns: List[str] = None,
     ) -> pd.DataFrame:
         """Serialize incoming buffered data to a pandas DataFrame."""
-        json_data = json.load(data)
-        json_dataframe = pd.DataFrame(json_data)
+        with data.getbuffer() as buffer:
+            json_data = orjson.loads(buffer)
+
+        if isinstance(json_data, list):
+            source_columns = list(json_data[0]) if json_data else []
+        else:
+            source_columns = list(json_data)
+
+        if columns:
+            requested = self._source_columns(columns, columns_renamer)
+            source_columns = [c for c in requested if c in source_columns]
+
+        index = self._index(json_data)
+
+        json_columns = {
+            column: self._typed_column(
+                self._column_values(json_data, column, index),
+                column,
+                columns_renamer,
+            )
+            for column in source_columns
+        }
+
+        json_dataframe = pd.DataFrame(json_columns, copy=False)
 
         if columns_renamer:
             json_dataframe = json_dataframe.rename(columns=columns_renamer)
@@ -37,10 +205,17 @@ class ExcelSerializer(Serializer):
     """Serializer class for excel."""
 
     def serialize(
-        self, data: io.BytesIO, columns_renamer: Dict = None
+        self,
+        data: io.BytesIO,
+        columns_renamer: Dict = None,
+        columns: List[str] = None,
     ) -> pd.DataFrame:
         """Serialize incoming buffered data to a pandas DataFrame."""
-        excel_dataframe = pd.read_excel(data)
+        usecols = None
+        if columns:
+            usecols = self._source_columns(columns, columns_renamer)
+
+        excel_dataframe = pd.read_excel(data, usecols=usecols)
 
         if columns_renamer:
             excel_dataframe = excel_dataframe.rename(columns=columns_renamer)
@@ -49,18 +224,162 @@ class ExcelSerializer(Serializer):
 
 
 class CsvSerializer(Serializer):
-    """Serializer class for csv."""
+    """Serializer class for csv.
+
+    Series columns are parsed with the explicit dtypes and date format of
+    the series schema instead of being inferred. Integer columns are parsed
+    as floats, since they can have missing values, and cast to integers
+    when they have none.
+
+    Parameters:
+    engine (str): pandas csv parser engine, "c" or "pyarrow".
+    """
+
+    def __init__(self, engine: str = "c") -> None:
+        self._engine = engine
+
+    def _cast_integer_columns(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """Cast integer columns without missing values back to integers."""
+        dtypes = self._schema_dtypes(dataframe)
+        if dtypes:
+            dataframe = dataframe.astype(dtypes)
+
+        return dataframe
+
+    def _read_options(
+        self, columns_renamer: Dict = None, columns: List[str] = None
+    ) -> Dict:
+        """Build the read_csv options of the series schema."""
+        source_names = {}
+        if columns_renamer:
+            source_names = {
+                target: source for source, target in columns_renamer.items()
+            }
+
+        def _source(column: str) -> str:
+            return source_names.get(column, column)
+
+        usecols = None
+        if columns:
+            usecols = self._source_columns(columns, columns_renamer)
+
+        date_columns = [
+            _source(column)
+            for column in STOCK_SERIES_DATE_COLUMNS
+            if usecols is None or _source(column) in usecols
+        ]
+
+        return {
+            "usecols": usecols,
+            "dtype": {
+                _source(column): (
+                    "float64" if is_integer_dtype(dtype) else dtype
+                )
+                for column, dtype in STOCK_SERIES_COLUMNS_DTYPES.items()
+            },
+            "parse_dates": date_columns,
+            "date_format": STOCK_SERIES_DATE_FORMAT,
+        }
 
     def serialize(
-        self, data: io.BytesIO, columns_renamer: Dict = None
+        self,
+        data: io.BytesIO,
+        columns_renamer: Dict = None,
+        columns: List[str] = None,
     ) -> pd.DataFrame:
         """Serialize incoming buffered data to a pandas DataFrame."""
-        csv_dataframe = pd.read_csv(data)
+        csv_dataframe = pd.read_csv(
+            data,
+            engine=self._engine,
+            **self._read_options(columns_renamer, columns),
+        )
 
         if columns_renamer:
             csv_dataframe = csv_dataframe.rename(columns=columns_renamer)
 
-        return csv_dataframe
+        return self._cast_integer_columns(csv_dataframe)
+
+    def iter_serialize(
+        self,
+        data: io.BytesIO,
+        columns_renamer: Dict = None,
+        columns: List[str] = None,
+        chunk_rows: int = CHUNK_ROWS,
+    ) -> Iterator[pd.DataFrame]:
+        """Serialize incoming buffered data to pandas DataFrame chunks.
+
+        The pyarrow engine can not read in chunks, so chunks are always read
+        by the "c" engine.
+        """
+        with pd.read_csv(
+            data,
+            engine="c",
+            chunksize=chunk_rows,
+            **self._read_options(columns_renamer, columns),
+        ) as reader:
+            for chunk in reader:
+                if columns_renamer:
+                    chunk = chunk.rename(columns=columns_renamer)
+
+                yield self._cast_integer_columns(chunk)
+
+
+class ParquetSerializer(Serializer):
+    """Serializer class for parquet.
+
+    Chunks are read as record batches of the parquet file, so only the
+    columns of one batch are converted to pandas at a time.
+    """
+
+    def serialize(
+        self,
+        data: io.BytesIO,
+        columns_renamer: Dict = None,
+        columns: List[str] = None,
+    ) -> pd.DataFrame:
+        """Serialize incoming buffered data to a pandas DataFrame."""
+        source_columns = None
+        if columns:
+            source_columns = self._source_columns(columns, columns_renamer)
+
+        parquet_dataframe = pd.read_parquet(
+            data, engine="pyarrow", columns=source_columns
+        )
+
+        if columns_renamer:
+            parquet_dataframe = parquet_dataframe.rename(
+                columns=columns_renamer
+            )
+
+        return self._apply_schema(parquet_dataframe)
+
+    def iter_serialize(
+        self,
+        data: io.BytesIO,
+        columns_renamer: Dict = None,
+        columns: List[str] = None,
+        chunk_rows: int = CHUNK_ROWS,
+    ) -> Iterator[pd.DataFrame]:
+        """Serialize incoming buffered data to pandas DataFrame chunks."""
+        source_columns = None
+        if columns:
+            source_columns = self._source_columns(columns, columns_renamer)
+
+        parquet_file = pq.ParquetFile(data)
+
+        start = 0
+        for batch in parquet_file.iter_batches(
+            batch_size=chunk_rows, columns=source_columns
+        ):
+            chunk = batch.to_pandas()
+            # Chunks are indexed by row number in the file, like csv chunks.
+            chunk.index = pd.RangeIndex(start, start + len(chunk))
+            start += len(chunk)
+
+            if columns_renamer:
+                chunk = chunk.rename(columns=columns_renamer)
+
+            yield self._apply_schema(chunk)
 
 
 class SerializerFactory:
@@ -71,12 +390,18 @@ class SerializerFactory:
             SerializerType.JSON: JsonSerializer,
             SerializerType.CSV: CsvSerializer,
             SerializerType.EXCEL: ExcelSerializer,
+            SerializerType.PARQUET: ParquetSerializer,
         }
+        self._options = {}
 
     def with_format(self, file_format: SerializerType):  # noqa
         self._format = file_format
         return self
 
+    def with_options(self, **options):  # noqa
+        self._options = options
+        return self
+
     def build(self) -> Serializer:
         """Build instance."""
         if not self._format:
@@ -84,4 +409,4 @@ class SerializerFactory:
 
         serializer = self._serializers[self._format]
 
-        return serializer()
+        return serializer(**self._options)
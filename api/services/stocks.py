@@ -1,19 +1,41 @@
+import asyncio
 import logging
-from typing import List, Tuple
+import posixpath
+from datetime import date
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
 
+import pandas as pd
+from fastapi import HTTPException
 from fastapi.exceptions import ValidationException
+from google.cloud.storage import Blob
+from starlette.concurrency import run_in_threadpool
 
-from api.repositories.stocks import StockMetadataRepository
+from api.repositories.stocks import SORTABLE_FIELDS, StockMetadataRepository
 from api.repositories.storage import StockSeriesRepository
 from api.schemas.database import SortOptions
 from api.schemas.stock import (
     STOCK_SERIES_COLUMNS_RENAMER,
+    AggregationInterval,
     Stock,
+    StockAggregateSeries,
     StockFileType,
     StockSeries,
+    StockSummary,
 )
-from api.services.serializers import SerializerFactory
+from api.services.cache import (
+    SeriesCache,
+    SeriesCacheKey,
+    SeriesSidecarCache,
+)
+from api.services.serializers import Serializer, SerializerFactory
 from api.utils import api_errors
+from api.utils.cursor import decode_cursor, encode_cursor
+from api.utils.metrics import observe_download
+from api.utils.timing import series_file_type, stage
+from api.utils.ttl_cache import TTLCache
+
+SUMMARY_WINDOW = pd.DateOffset(weeks=52)
+SUMMARY_FIELDS = ["close", "high", "low", "volume"]
 
 
 class StockService:
@@ -25,64 +47,637 @@ class StockService:
         csv_stock_series_repository: StockSeriesRepository,
         excel_stock_series_repository: StockSeriesRepository,
         json_stock_series_repository: StockSeriesRepository,
+        parquet_stock_series_repository: StockSeriesRepository,
+        series_cache: SeriesCache = None,
+        batch_concurrency: int = 8,
+        csv_engine: str = "c",
+        sidecar_cache: SeriesSidecarCache = None,
+        blob_cache: TTLCache = None,
     ) -> None:
         self._stock_metadata_repository = stock_metadata_repository
         self._csv_stock_series_repository = csv_stock_series_repository
         self._excel_stock_series_repository = excel_stock_series_repository
         self._json_stock_series_repository = json_stock_series_repository
+        self._parquet_stock_series_repository = parquet_stock_series_repository
+        self._series_cache = series_cache
+        self._sidecar_cache = sidecar_cache
+        self._blob_cache = blob_cache
+        self._batch_concurrency = batch_concurrency
+        self._serializer_options = {StockFileType.CSV: {"engine": csv_engine}}
 
         self._series_repository = {
             StockFileType.CSV: self._csv_stock_series_repository,
             StockFileType.EXCEL: self._excel_stock_series_repository,
             StockFileType.JSON: self._json_stock_series_repository,
+            StockFileType.PARQUET: self._parquet_stock_series_repository,
         }
 
-    def get(self, id: str) -> Tuple[Stock, StockSeries]:
-        """Get a stock and its series given a stock id."""
-        stock = self._stock_metadata_repository.get_by_id(id)
+    def _build_serializer(self, file_format: StockFileType) -> Serializer:
+        serializer_factory = SerializerFactory()
+        serializer_factory.with_format(file_format)
+        serializer_factory.with_options(
+            **self._serializer_options.get(file_format, {})
+        )
 
-        if not stock:
+        return serializer_factory.build()
+
+    def _download(
+        self,
+        series_repository: StockSeriesRepository,
+        blob: Blob,
+        blob_name: str,
+    ) -> BinaryIO:
+        buffered_data = series_repository.download_as_buffer(
+            blob_name,
+            generation=blob.generation,
+            size=blob.size,
+        )
+        symbol, _ = posixpath.splitext(blob_name)
+        observe_download(symbol, blob.size or 0)
+
+        return buffered_data
+
+    def _read_series(
+        self,
+        series_repository: StockSeriesRepository,
+        blob: Blob,
+        blob_name: str,
+        file_format: StockFileType,
+        columns: List[str] = None,
+        start: date = None,
+        end: date = None,
+        cache_key: SeriesCacheKey = None,
+    ) -> pd.DataFrame:
+        """Download and parse a stock series blob (blocking).
+
+        A projected read with a date range is parsed in chunks and filtered
+        chunk by chunk, so rows out of the range are never accumulated.
+
+        Excel series are slow to parse, so the first read of a blob
+        generation is written to a parquet sidecar and later reads are
+        served from it.
+        """
+        use_sidecar = (
+            self._sidecar_cache is not None
+            and cache_key is not None
+            and file_format == StockFileType.EXCEL
+        )
+
+        if use_sidecar:
+            with stage("parse"):
+                data = self._sidecar_cache.get(cache_key, columns)
+
+            if data is not None:
+                return data
+
+        data_serializer = self._build_serializer(file_format)
+        buffered_data = self._download(series_repository, blob, blob_name)
+
+        with stage("parse"):
+            if use_sidecar:
+                data = data_serializer.serialize(
+                    buffered_data, STOCK_SERIES_COLUMNS_RENAMER
+                )
+                self._sidecar_cache.put(cache_key, data)
+
+                return data[columns] if columns else data
+
+            if not columns or (start is None and end is None):
+                return data_serializer.serialize(
+                    buffered_data,
+                    STOCK_SERIES_COLUMNS_RENAMER,
+                    columns=columns,
+                )
+
+            chunks = [
+                self._filter_dates(chunk, start, end)
+                for chunk in data_serializer.iter_serialize(
+                    buffered_data,
+                    STOCK_SERIES_COLUMNS_RENAMER,
+                    columns=columns,
+                )
+            ]
+
+            return pd.concat(chunks)
+
+    async def _get_series_blob(self, stock: Stock) -> Blob:
+        """Get the metadata of a stock series blob.
+
+        Metadata is kept in the blob cache, when set, so storage is only
+        asked again once it expires. Until then, a new generation of the
+        blob is not seen.
+        """
+        series_repository: StockSeriesRepository = self._series_repository[
+            stock.file_format
+        ]
+
+        stock_series_blob_name = f"{stock.symbol}.{stock.file_format}"
+        blob_key = (stock.file_format, stock_series_blob_name)
+
+        blob = None
+        if self._blob_cache is not None:
+            blob = self._blob_cache.get(blob_key)
+
+        if blob is None:
+            with series_file_type(stock.file_format):
+                blob = await run_in_threadpool(
+                    series_repository.get_blob, stock_series_blob_name
+                )
+
+            if blob and self._blob_cache is not None:
+                self._blob_cache.set(blob_key, blob)
+
+        if not blob:
+            logging.error(
+                f"Series blob [{stock_series_blob_name}] not found "
+                f"for stock [{stock.id}]."
+            )
             api_errors.raise_error_response(
-                api_errors.NotFound, detail=f"Stock with id [{id}] not found."
+                api_errors.NotFound,
+                detail=f"Series for stock with id [{stock.id}] not found.",
             )
 
+        return blob
+
+    async def _load_series(
+        self,
+        stock: Stock,
+        columns: List[str] = None,
+        blob: Blob = None,
+        start: date = None,
+        end: date = None,
+    ) -> pd.DataFrame:
+        """Load a stock series, projected to `columns` when provided.
+
+        Series are served from the series cache, when set, projected to
+        `columns`. On a cache miss, the projection and the date range
+        (`start`, `end`) are pushed down to the serializer, and only series
+        read whole (without `columns`) are stored in the cache. Callers
+        still filter the dates of the returned series. Blocking storage and
+        parsing work runs in the threadpool, so the event loop keeps serving
+        other requests.
+        """
         series_repository: StockSeriesRepository = self._series_repository[
             stock.file_format
         ]
 
-        serializer_factory = SerializerFactory()
-        serializer_factory.with_format(stock.file_format)
-        data_serializer = serializer_factory.build()
-
         stock_series_blob_name = f"{stock.symbol}.{stock.file_format}"
 
-        buffered_data = series_repository.download_as_buffer(
-            stock_series_blob_name
+        if blob is None:
+            blob = await self._get_series_blob(stock)
+
+        cache_key = SeriesCacheKey(
+            stock.symbol, stock.file_format, blob.generation
         )
 
-        data = data_serializer.serialize(
-            buffered_data, STOCK_SERIES_COLUMNS_RENAMER
+        if self._series_cache is not None:
+            data = self._series_cache.get(cache_key)
+
+            if data is not None:
+                return data[columns] if columns else data
+
+        with series_file_type(stock.file_format):
+            data = await run_in_threadpool(
+                self._read_series,
+                series_repository,
+                blob,
+                stock_series_blob_name,
+                stock.file_format,
+                columns,
+                start,
+                end,
+                cache_key,
+            )
+
+        # Series read without a projection are read whole, whatever the
+        # date range.
+        if self._series_cache is not None and not columns:
+            self._series_cache.put(cache_key, data)
+
+        return data
+
+    def _format_fields(self, fields: List[str]) -> List[str]:
+        invalid_fields = set(fields) - set(StockSeries.fields())
+
+        if invalid_fields:
+            logging.error(f"Invalid query parameter 'fields' [{fields}].")
+            api_errors.raise_error_response(
+                api_errors.ErrorInvalidQueryParameters,
+                detail="Invalid query parameter 'fields'.",
+            )
+
+        # "date" is always returned, since it indexes every other column.
+        return [
+            field
+            for field in StockSeries.fields()
+            if field == "date" or field in fields
+        ]
+
+    def _validate_date_range(self, start: date, end: date) -> None:
+        if start is not None and end is not None and start > end:
+            logging.error(f"Invalid date range [{start}, {end}].")
+            api_errors.raise_error_response(
+                api_errors.ErrorInvalidQueryParameters,
+                detail="Query parameter 'start' must not be after 'end'.",
+            )
+
+    def _filter_dates(
+        self, data: pd.DataFrame, start: date = None, end: date = None
+    ) -> pd.DataFrame:
+        if start is None and end is None:
+            return data
+
+        dates = pd.to_datetime(data["date"])
+        mask = pd.Series(True, index=data.index)
+
+        if start is not None:
+            mask &= dates >= pd.Timestamp(start)
+
+        if end is not None:
+            mask &= dates <= pd.Timestamp(end)
+
+        return data[mask]
+
+    async def get_series_metadata(self, id: str) -> Tuple[Stock, Blob]:
+        """Get a stock and its series blob metadata given a stock id.
+
+        Nothing is downloaded, so this is cheap enough to answer conditional
+        requests.
+        """
+        stock = await run_in_threadpool(
+            self._stock_metadata_repository.get_by_id, id
         )
 
-        return stock, StockSeries.from_dataframe(data)
+        if not stock:
+            api_errors.raise_error_response(
+                api_errors.NotFound, detail=f"Stock with id [{id}] not found."
+            )
+
+        return stock, await self._get_series_blob(stock)
+
+    async def get_dataframe(
+        self,
+        id: str,
+        start: date = None,
+        end: date = None,
+        fields: List[str] = None,
+        series_metadata: Tuple[Stock, Blob] = None,
+    ) -> Tuple[Stock, pd.DataFrame]:
+        """Get a stock and its series as a DataFrame given a stock id.
+
+        Parameters:
+        id (str): stock identifier.
+        start (date): first date of the series, inclusive.
+        end (date): last date of the series, inclusive.
+        fields (list[str]): series columns to return, all if not set.
+        series_metadata (tuple): stock and blob from `get_series_metadata`,
+        looked up if not set.
+        """
+        self._validate_date_range(start, end)
+
+        columns = self._format_fields(fields) if fields else None
+
+        if series_metadata is None:
+            series_metadata = await self.get_series_metadata(id)
+
+        stock, blob = series_metadata
+
+        data = await self._load_series(
+            stock, columns, blob=blob, start=start, end=end
+        )
+
+        return stock, self._filter_dates(data, start, end)
+
+    def _iter_read_series(
+        self,
+        series_repository: StockSeriesRepository,
+        blob: Blob,
+        blob_name: str,
+        file_format: StockFileType,
+        columns: List[str] = None,
+        start: date = None,
+        end: date = None,
+        cache_key: SeriesCacheKey = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Download a stock series blob and parse it in chunks (blocking).
+
+        Chunks are filtered by date as they are parsed. Formats that can not
+        be parsed in chunks, and excel series read through their sidecar,
+        are parsed at once and yielded as a single chunk.
+        """
+        if file_format == StockFileType.EXCEL:
+            with series_file_type(file_format):
+                data = self._read_series(
+                    series_repository,
+                    blob,
+                    blob_name,
+                    file_format,
+                    columns,
+                    cache_key=cache_key,
+                )
+
+            yield self._filter_dates(data, start, end)
+            return
+
+        # Iterators may be resumed from different threads and contexts, so
+        # the stage file type is set and reset between two chunks.
+        data_serializer = self._build_serializer(file_format)
+        with series_file_type(file_format):
+            buffered_data = self._download(series_repository, blob, blob_name)
+
+        chunks = data_serializer.iter_serialize(
+            buffered_data, STOCK_SERIES_COLUMNS_RENAMER, columns=columns
+        )
+        while True:
+            # Chunks are parsed as they are consumed, so only their parsing
+            # is timed, without the time the consumer takes.
+            with series_file_type(file_format), stage("parse"):
+                chunk = next(chunks, None)
+
+                if chunk is not None:
+                    chunk = self._filter_dates(chunk, start, end)
+
+            if chunk is None:
+                return
+
+            yield chunk
+
+    async def iter_dataframe(
+        self,
+        id: str,
+        start: date = None,
+        end: date = None,
+        fields: List[str] = None,
+        series_metadata: Tuple[Stock, Blob] = None,
+    ) -> Tuple[Stock, Iterator[pd.DataFrame]]:
+        """Get a stock and its series as DataFrame chunks given a stock id.
+
+        Cached series are returned as a single chunk. Otherwise the returned
+        iterator is blocking: it downloads the series once iterated and
+        parses it chunk by chunk, so the whole series is never held in
+        memory for formats that can be parsed in chunks. Series read this
+        way are not cached.
+
+        Parameters are the ones of `get_dataframe`.
+        """
+        self._validate_date_range(start, end)
+
+        columns = self._format_fields(fields) if fields else None
+
+        if series_metadata is None:
+            series_metadata = await self.get_series_metadata(id)
+
+        stock, blob = series_metadata
+
+        cache_key = SeriesCacheKey(
+            stock.symbol, stock.file_format, blob.generation
+        )
+
+        if self._series_cache is not None:
+            data = self._series_cache.get(cache_key)
+
+            if data is not None:
+                data = data[columns] if columns else data
+                return stock, iter([self._filter_dates(data, start, end)])
+
+        return stock, self._iter_read_series(
+            self._series_repository[stock.file_format],
+            blob,
+            f"{stock.symbol}.{stock.file_format}",
+            stock.file_format,
+            columns,
+            start,
+            end,
+            cache_key,
+        )
+
+    async def get_many(
+        self,
+        ids: List[str],
+        start: date = None,
+        end: date = None,
+        fields: List[str] = None,
+    ) -> Tuple[Dict[str, Tuple[Stock, pd.DataFrame]], List[str]]:
+        """Get many stocks and their series as DataFrames given stock ids.
+
+        Metadata is read with a single query and the series are loaded
+        concurrently, at most `batch_concurrency` at a time. Returns the
+        series by stock id, in the order of `ids`, and the ids of stocks or
+        series that were not found.
+        """
+        self._validate_date_range(start, end)
+
+        columns = self._format_fields(fields) if fields else None
+        ids = list(dict.fromkeys(ids))
+
+        try:
+            stocks = await run_in_threadpool(
+                self._stock_metadata_repository.list_by_ids, ids
+            )
+        except ValidationException:
+            logging.error(f"Invalid query parameter 'ids' [{ids}].")
+            api_errors.raise_error_response(
+                api_errors.ErrorInvalidQueryParameters,
+                detail="Invalid query parameter 'ids'.",
+            )
+
+        semaphore = asyncio.Semaphore(self._batch_concurrency)
+
+        async def _load(stock: Stock) -> Optional[pd.DataFrame]:
+            async with semaphore:
+                try:
+                    data = await self._load_series(
+                        stock, columns, start=start, end=end
+                    )
+                except HTTPException as e:
+                    if e.status_code != api_errors.NotFound.status_code:
+                        raise
+                    return None
+
+            return self._filter_dates(data, start, end)
+
+        series = await asyncio.gather(*[_load(stock) for stock in stocks])
+
+        loaded = {
+            stock.id: (stock, data)
+            for stock, data in zip(stocks, series)
+            if data is not None
+        }
+
+        return (
+            {id: loaded[id] for id in ids if id in loaded},
+            [id for id in ids if id not in loaded],
+        )
+
+    async def get(
+        self,
+        id: str,
+        start: date = None,
+        end: date = None,
+        fields: List[str] = None,
+    ) -> Tuple[Stock, StockSeries]:
+        """Get a stock and its series given a stock id."""
+        stock, data = await self.get_dataframe(id, start, end, fields)
+
+        with stage("validation"):
+            return stock, StockSeries.from_dataframe(data)
+
+    def _aggregate_dataframe(
+        self, data: pd.DataFrame, interval: AggregationInterval
+    ) -> pd.DataFrame:
+        data = data.set_index(pd.to_datetime(data["date"]))
+        resampler = data.resample(interval.value)
+
+        aggregated = resampler.agg(
+            {
+                "open": "first",
+                "high": "max",
+                "low": "min",
+                "close": "last",
+                "volume": "sum",
+                "turnover": "sum",
+            }
+        )
+
+        traded_value = (data["vwap"] * data["volume"]).resample(interval.value)
+        aggregated["vwap"] = traded_value.sum() / aggregated["volume"].where(
+            aggregated["volume"] > 0
+        )
+
+        aggregated = aggregated[resampler["close"].count() > 0]
+
+        return aggregated.rename_axis("date").reset_index()
+
+    async def aggregate(
+        self,
+        id: str,
+        interval: AggregationInterval,
+        start: date = None,
+        end: date = None,
+    ) -> Tuple[Stock, StockAggregateSeries]:
+        """Get a stock and its series aggregated by `interval`.
+
+        Each period has the first open, max high, min low, last close,
+        summed volume and turnover, and volume weighted vwap. Periods are
+        labelled by their end date and periods without trades are dropped.
+        """
+        stock, data = await self.get_dataframe(
+            id, start, end, fields=StockAggregateSeries.fields()
+        )
+
+        aggregated = await run_in_threadpool(
+            self._aggregate_dataframe, data, interval
+        )
+
+        with stage("validation"):
+            return stock, StockAggregateSeries.from_dataframe(aggregated)
+
+    def _summarize_dataframe(self, data: pd.DataFrame) -> StockSummary:
+        dates = pd.to_datetime(data["date"])
+        last = dates.idxmax()
+        as_of = dates[last]
+
+        window = data[dates > as_of - SUMMARY_WINDOW]
+        statistics = {
+            "last_close": data.at[last, "close"],
+            "high_52_weeks": window["high"].max(),
+            "low_52_weeks": window["low"].min(),
+            "average_volume_52_weeks": window["volume"].mean(),
+        }
+
+        return StockSummary(
+            as_of=as_of.to_pydatetime(),
+            **{
+                name: None if pd.isna(value) else float(value)
+                for name, value in statistics.items()
+            },
+        )
+
+    async def summarize(self, id: str) -> Optional[StockSummary]:
+        """Compute and store the series summary of a stock given its id.
+
+        The summary has the last close and the 52 weeks high, low and
+        average volume up to the last observation. Nothing is stored for an
+        empty series and None is returned.
+        """
+        stock, data = await self.get_dataframe(id, fields=SUMMARY_FIELDS)
+
+        if data.empty:
+            logging.warning(f"Series for stock [{stock.id}] is empty.")
+            return None
+
+        summary = await run_in_threadpool(self._summarize_dataframe, data)
+
+        await run_in_threadpool(
+            self._stock_metadata_repository.update_summary, stock.id, summary
+        )
+
+        return summary
 
     def _format_sort(self, sort_input: str) -> List[Tuple]:
         order = SortOptions.ASCENDING.value
-        if "-" in sort_input:
+        if sort_input.startswith("-"):
             order = SortOptions.DESCENDING.value
-            sort_input = sort_input.replace("-", "")
+            sort_input = sort_input[1:]
 
         return [(sort_input, order)]
 
     def _is_valid_sort_input(self, sort_input: str) -> bool:
-        for field in Stock.fields():
-            if field in sort_input:
-                return True
+        return sort_input.removeprefix("-") in SORTABLE_FIELDS
 
-        return False
+    def _decode_cursor(self, cursor: str, sort: List[Tuple]) -> Tuple:
+        try:
+            payload = decode_cursor(cursor)
+        except ValueError:
+            logging.error(f"Invalid query parameter 'cursor' [{cursor}].")
+            api_errors.raise_error_response(
+                api_errors.ErrorInvalidQueryParameters,
+                detail="Invalid query parameter 'cursor'.",
+            )
 
-    def list(self, skip: int, limit: int, sort_input: str) -> Stock:
-        """List stock metadata."""
+        if (payload["field"], payload["order"]) != sort[0]:
+            logging.error(
+                f"Cursor sort [{payload['field']}, {payload['order']}] "
+                f"does not match sort [{sort}]."
+            )
+            api_errors.raise_error_response(
+                api_errors.ErrorInvalidQueryParameters,
+                detail="Query parameter 'cursor' does not match 'sort'.",
+            )
+
+        return payload["value"], payload["id"]
+
+    def _next_cursor(
+        self, stocks: List[Stock], limit: int, sort: List[Tuple]
+    ) -> Optional[str]:
+        if not stocks or len(stocks) < limit:
+            return None
+
+        sort_field, sort_order = sort[0]
+        last_stock = stocks[-1]
+
+        return encode_cursor(
+            sort_field,
+            sort_order,
+            getattr(last_stock, sort_field),
+            last_stock.id,
+        )
+
+    async def list(
+        self,
+        skip: int,
+        limit: int,
+        sort_input: str,
+        cursor: str = None,
+        include_total: bool = True,
+    ) -> Tuple[List[Stock], Optional[int], Optional[str]]:
+        """List stock metadata.
+
+        Returns the stocks of the page, the total of stocks (None unless
+        `include_total`) and a cursor for the next page, if the page is full.
+        When a `cursor` is given, the page starts after it instead of
+        skipping `skip` stocks.
+        """
         sort = self._format_sort(sort_input)
 
         if not self._is_valid_sort_input(sort_input):
@@ -92,9 +687,26 @@ class StockService:
                 detail="Invalid query parameter 'sort'.",
             )
 
+        after = None
+        if cursor:
+            if skip:
+                logging.error("Query parameters 'skip' and 'cursor' given.")
+                api_errors.raise_error_response(
+                    api_errors.ErrorInvalidQueryParameters,
+                    detail="Query parameters 'skip' and 'cursor' are "
+                    "mutually exclusive.",
+                )
+
+            after = self._decode_cursor(cursor, sort)
+
         try:
-            stocks, total = self._stock_metadata_repository.list(
-                skip, limit, sort
+            stocks, total = await run_in_threadpool(
+                self._stock_metadata_repository.list,
+                skip,
+                limit,
+                sort,
+                after,
+                include_total,
             )
         except ValidationException:
             api_errors.raise_error_response(
@@ -108,4 +720,4 @@ class StockService:
 
         logging.info(f"Total stock metadata [{total}].")
 
-        return stocks, total
+        return stocks, total, self._next_cursor(stocks, limit, sort)
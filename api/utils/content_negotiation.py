@@ -0,0 +1,85 @@
+from typing import List, Optional, Tuple
+
+
+def _parse_accept(accept: str) -> List[Tuple[str, float]]:
+    """Parse an Accept header into (media range, quality) pairs.
+
+    Media ranges with an invalid quality are ignored.
+    """
+    media_ranges = []
+    for item in accept.split(","):
+        media_range, *parameters = item.split(";")
+        media_range = media_range.strip().lower()
+
+        if not media_range:
+            continue
+
+        quality = 1.0
+        for parameter in parameters:
+            name, _, value = parameter.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = -1.0
+
+        if 0.0 <= quality <= 1.0:
+            media_ranges.append((media_range, quality))
+
+    return media_ranges
+
+
+def _specificity(media_range: str, media_type: str) -> int:
+    """Rank how specifically a media range matches a media type, -1 if not.
+
+    An exact match ranks 2, "type/*" ranks 1 and "*/*" ranks 0.
+    """
+    if media_range == media_type:
+        return 2
+
+    if media_range == f"{media_type.split('/')[0]}/*":
+        return 1
+
+    if media_range == "*/*":
+        return 0
+
+    return -1
+
+
+def negotiate_media_type(
+    accept: Optional[str], media_types: List[str]
+) -> Optional[str]:
+    """Choose the media type to respond with given an Accept header.
+
+    Every media type gets the quality of the most specific media range
+    matching it, and the one with the highest quality is chosen, ties going
+    to the media range the client listed first and then to the order of
+    `media_types`. Media types with a quality of 0 are never chosen.
+    Requests without an Accept header get the first media type, and None
+    is returned when no media type is acceptable.
+    """
+    if not accept:
+        return media_types[0]
+
+    media_ranges = _parse_accept(accept)
+
+    best_media_type, best_rank = None, None
+    for media_type in media_types:
+        matches = [
+            (_specificity(media_range, media_type), quality, -position)
+            for position, (media_range, quality) in enumerate(media_ranges)
+            if _specificity(media_range, media_type) >= 0
+        ]
+
+        if not matches:
+            continue
+
+        _, quality, position = max(matches)
+        if quality <= 0:
+            continue
+
+        rank = (quality, position)
+        if best_rank is None or rank > best_rank:
+            best_media_type, best_rank = media_type, rank
+
+    return best_media_type
@@ -0,0 +1,56 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Dict
+
+from bson import ObjectId, json_util
+from bson.errors import BSONError
+
+# Types of the sort values a cursor can hold. Anything else (e.g. a dict
+# of query operators) is rejected, so cursors can not change the query.
+CURSOR_VALUE_TYPES = (str, int, float, bool, datetime, type(None))
+
+
+def encode_cursor(
+    sort_field: str, sort_order: int, value: Any, id: str
+) -> str:
+    """Encode an opaque keyset pagination cursor.
+
+    The cursor holds the sort of the listing and the sort value and id of
+    the last document of the page.
+    """
+    payload = json_util.dumps(
+        {"field": sort_field, "order": sort_order, "value": value, "id": id}
+    )
+
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor created by `encode_cursor`.
+
+    Raises ValueError if the cursor is malformed, or if its sort value is
+    not a plain value or its id not an ObjectId.
+    """
+    try:
+        payload = json_util.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError, BSONError) as e:
+        raise ValueError(f"Malformed cursor [{cursor}].") from e
+
+    if not isinstance(payload, dict) or set(payload) != {
+        "field",
+        "order",
+        "value",
+        "id",
+    }:
+        raise ValueError(f"Malformed cursor [{cursor}].")
+
+    if not isinstance(payload["value"], CURSOR_VALUE_TYPES):
+        raise ValueError(f"Invalid cursor value [{cursor}].")
+
+    if not isinstance(payload["id"], ObjectId) and not (
+        isinstance(payload["id"], str) and ObjectId.is_valid(payload["id"])
+    ):
+        raise ValueError(f"Invalid cursor id [{cursor}].")
+
+    return payload
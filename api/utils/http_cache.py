@@ -0,0 +1,100 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Iterable, Optional
+
+from google.cloud.storage import Blob
+
+from api.schemas.stock import Stock
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC, as they are stored in Mongo."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+
+    return value.astimezone(timezone.utc)
+
+
+def series_etag(stock: Stock, blob: Blob, variant: Iterable[Any]) -> str:
+    """Build a strong ETag for a stock series representation.
+
+    The tag changes when the stock metadata or the series blob changes, and
+    is different for every representation of the series (`variant`), e.g.
+    media type, date range and fields.
+    """
+    version = blob.generation or blob.md5_hash or blob.etag
+    parts = [stock.id, version, stock.last_updated, *variant]
+
+    digest = hashlib.sha1(
+        "|".join("" if part is None else str(part) for part in parts).encode()
+    ).hexdigest()
+
+    return f'"{digest}"'
+
+
+def series_last_modified(stock: Stock, blob: Blob) -> Optional[datetime]:
+    """Get when a stock or its series blob was last modified, if known."""
+    dates = [
+        _as_utc(value)
+        for value in (stock.last_updated, blob.updated)
+        if value is not None
+    ]
+
+    if not dates:
+        return None
+
+    # HTTP dates have a resolution of seconds.
+    return max(dates).replace(microsecond=0)
+
+
+def cache_headers(
+    etag: str, last_modified: Optional[datetime]
+) -> Dict[str, str]:
+    """Get the validator headers of a response."""
+    headers = {"ETag": etag}
+
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    return headers
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check If-None-Match with the weak comparison function (RFC 9110)."""
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque_tag = etag.removeprefix("W/")
+
+    return any(
+        tag.strip().removeprefix("W/") == opaque_tag
+        for tag in if_none_match.split(",")
+    )
+
+
+def _parse_http_date(value: str) -> Optional[datetime]:
+    try:
+        return _as_utc(parsedate_to_datetime(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_not_modified(
+    headers: Dict[str, str], etag: str, last_modified: Optional[datetime]
+) -> bool:
+    """Check if a conditional GET can be answered with 304 Not Modified.
+
+    If-Modified-Since is only evaluated when the request has no
+    If-None-Match, and is ignored when it is not a valid HTTP date.
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since is not None and last_modified is not None:
+        since = _parse_http_date(if_modified_since)
+        return since is not None and last_modified <= since
+
+    return False
@@ -0,0 +1,107 @@
+from typing import Any, Callable, Dict, Tuple
+
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.metrics import MetricWrapperBase
+
+
+# Prometheus metrics, exposed by the /metrics route. Labeled children are
+# looked up once and kept in `_children`, so recording only takes the
+# uncontended lock of the value it updates.
+requests_total = Counter(
+    "stocks_api_requests",
+    "Requests by method, route and status.",
+    ["method", "route", "status"],
+)
+request_duration = Histogram(
+    "stocks_api_request_duration_seconds",
+    "Request latency by method and route.",
+    ["method", "route"],
+)
+stage_duration = Histogram(
+    "stocks_api_stage_duration_seconds",
+    "Request stage latency by stage and series file type.",
+    ["stage", "file_type"],
+)
+downloaded_bytes = Counter(
+    "stocks_api_downloaded_bytes",
+    "Series bytes downloaded by symbol.",
+    ["symbol"],
+)
+count_duration = Histogram(
+    "stocks_api_count_duration_seconds",
+    "Stock count latency by strategy (estimated or exact).",
+    ["strategy"],
+)
+requests_in_flight = Gauge(
+    "stocks_api_requests_in_flight", "Requests being served."
+)
+
+_children: Dict[Tuple, Any] = {}
+
+UNMATCHED_ROUTE = "unmatched"
+
+# Route path templates by endpoint, see `route_path`.
+_route_paths: Dict[Callable, str] = {}
+
+
+def _labeled(metric: MetricWrapperBase, *labels: str) -> Any:
+    key = (metric, labels)
+    child = _children.get(key)
+
+    if child is None:
+        child = _children[key] = metric.labels(*labels)
+
+    return child
+
+
+def observe_request(
+    method: str, route: str, status: int, seconds: float
+) -> None:
+    """Record a served request."""
+    _labeled(requests_total, method, route, str(status)).inc()
+    _labeled(request_duration, method, route).observe(seconds)
+
+
+def observe_stage(stage: str, file_type: str, seconds: float) -> None:
+    """Record the latency of a request stage."""
+    _labeled(stage_duration, stage, file_type).observe(seconds)
+
+
+def observe_download(symbol: str, size: int) -> None:
+    """Record the bytes downloaded for the series of a symbol."""
+    _labeled(downloaded_bytes, symbol).inc(size)
+
+
+def observe_count(strategy: str, seconds: float) -> None:
+    """Record the latency of a stock count."""
+    _labeled(count_duration, strategy).observe(seconds)
+
+
+def route_path(scope: Dict) -> str:
+    """Get the path template of the route that served a request.
+
+    The route is taken from the scope when routing put it there, and
+    otherwise looked up by endpoint in the app routes once per endpoint.
+    Requests without a route (e.g. 404s) share the "unmatched" route, so
+    raw paths never become labels.
+    """
+    route = scope.get("route")
+    if route is not None:
+        return getattr(route, "path", UNMATCHED_ROUTE)
+
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return UNMATCHED_ROUTE
+
+    path = _route_paths.get(endpoint)
+    if path is None:
+        path = _route_paths[endpoint] = next(
+            (
+                route.path
+                for route in scope["app"].routes
+                if getattr(route, "endpoint", None) is endpoint
+            ),
+            UNMATCHED_ROUTE,
+        )
+
+    return path
@@ -1,15 +1,41 @@
+import re
 import uuid
+from contextvars import ContextVar, Token
+from typing import Optional
+
+REQUEST_ID_MAX_LENGTH = 128
+
+_REQUEST_ID_PATTERN = re.compile(
+    rf"[A-Za-z0-9._-]{{1,{REQUEST_ID_MAX_LENGTH}}}", re.ASCII
+)
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
 
 
 def get_request_id(original_id: str = "") -> str:
-    """Get a new request id.
+    """Get the id of a request.
 
-    If an original_id is provided, it concatenates the original and a new one:
-    {original_id}, {new_id}
+    The original_id is reused as is if provided (e.g. the X-Request-ID of
+    the request) and valid, at most REQUEST_ID_MAX_LENGTH letters, digits,
+    ".", "_" or "-", so it is safe to echo in headers and logs. A new id is
+    generated otherwise.
     """
-    new_id = uuid.uuid4()
+    if original_id and _REQUEST_ID_PATTERN.fullmatch(original_id):
+        return original_id
+
+    return str(uuid.uuid4())
+
+
+def set_current_request_id(request_id: str) -> Token:
+    """Set the id of the request being served."""
+    return _request_id.set(request_id)
+
+
+def reset_current_request_id(token: Token) -> None:
+    """Restore the request id set before `token`."""
+    _request_id.reset(token)
 
-    if original_id:
-        new_id = f"{original_id}, {new_id}"
 
-    return new_id
+def get_current_request_id() -> Optional[str]:
+    """Get the id of the request being served, None outside of requests."""
+    return _request_id.get()
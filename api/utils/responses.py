@@ -0,0 +1,65 @@
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+from fastapi.responses import JSONResponse, Response
+
+from api.schemas.stock import Stock
+from api.services.encoders import (
+    ARROW_STREAM_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    encode_stock_series,
+    encode_stock_series_arrow,
+    encode_stock_series_batch,
+    encode_stock_series_msgpack,
+)
+
+
+class StockSeriesJSONResponse(JSONResponse):
+    """JSON response for a stock and its series DataFrame.
+
+    Content is a (Stock, DataFrame) tuple, encoded by the fast path in
+    `encode_stock_series` instead of a validated StockResponse.
+    """
+
+    def render(self, content: Tuple[Stock, pd.DataFrame]) -> Any:
+        """Render response content."""
+        stock, data = content
+        return encode_stock_series(stock, data)
+
+
+class StockSeriesBatchJSONResponse(JSONResponse):
+    """JSON response for many stocks and their series DataFrames.
+
+    Content is a (series by id, not found ids) tuple, encoded by the fast
+    path in `encode_stock_series_batch`.
+    """
+
+    def render(
+        self,
+        content: Tuple[Dict[str, Tuple[Stock, pd.DataFrame]], List[str]],
+    ) -> Any:
+        """Render response content."""
+        series, not_found = content
+        return encode_stock_series_batch(series, not_found)
+
+
+class StockSeriesArrowResponse(Response):
+    """Arrow IPC stream response for a stock and its series DataFrame."""
+
+    media_type = ARROW_STREAM_MEDIA_TYPE
+
+    def render(self, content: Tuple[Stock, pd.DataFrame]) -> bytes:
+        """Render response content."""
+        stock, data = content
+        return encode_stock_series_arrow(stock, data)
+
+
+class StockSeriesMsgPackResponse(Response):
+    """MessagePack response for a stock and its series DataFrame."""
+
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Tuple[Stock, pd.DataFrame]) -> bytes:
+        """Render response content."""
+        stock, data = content
+        return encode_stock_series_msgpack(stock, data)
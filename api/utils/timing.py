@@ -0,0 +1,77 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Dict, Iterator, Optional
+
+from api.utils.metrics import observe_stage
+
+_stage_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "stage_timings", default=None
+)
+_file_type: ContextVar[str] = ContextVar("stage_file_type", default="")
+
+
+def start_timings() -> Token:
+    """Start collecting the stage timings of the current request."""
+    return _stage_timings.set({})
+
+
+def stop_timings(token: Token) -> Dict[str, float]:
+    """Stop collecting stage timings, returning them in seconds by stage."""
+    timings = _stage_timings.get() or {}
+    _stage_timings.reset(token)
+
+    return timings
+
+
+def get_timings() -> Dict[str, float]:
+    """Get a copy of the stage timings of the current request so far."""
+    return dict(_stage_timings.get() or {})
+
+
+def record_stage(name: str, seconds: float) -> None:
+    """Add `seconds` to the time of stage `name` of the current request.
+
+    The stage is also observed by the stage latency metric, labeled with
+    the current series file type. Nothing is added up outside of a request
+    (e.g. in commands).
+    """
+    observe_stage(name, _file_type.get(), seconds)
+
+    timings = _stage_timings.get()
+
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a stage of the current request.
+
+    Usable as a context manager or as a decorator of blocking functions.
+    A stage that runs more than once in a request (e.g. the series of a
+    batch) adds up, so concurrent stages can add up to more than the
+    request time.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - start)
+
+
+@contextmanager
+def series_file_type(file_type: str) -> Iterator[None]:
+    """Label the stages timed inside with a series file type."""
+    token = _file_type.set(file_type)
+    try:
+        yield
+    finally:
+        _file_type.reset(token)
+
+
+def server_timing(timings: Dict[str, float]) -> str:
+    """Format stage timings as a Server-Timing header value."""
+    return ", ".join(
+        f"{name};dur={seconds * 1000:.2f}" for name, seconds in timings.items()
+    )
@@ -0,0 +1,43 @@
+import threading
+import time
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """Small thread-safe cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, ttl: float, max_entries: int = 1024) -> None:
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a value, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Set a value, dropping the oldest entry when the cache is full."""
+        with self._lock:
+            if key not in self._entries and (
+                len(self._entries) >= self._max_entries
+            ):
+                del self._entries[next(iter(self._entries))]
+
+            self._entries[key] = (value, time.monotonic() + self._ttl)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
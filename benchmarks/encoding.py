@@ -0,0 +1,112 @@
+import argparse
+import io
+import os
+import timeit
+from datetime import datetime
+from typing import Callable, Dict
+
+import pandas as pd
+
+from api.schemas.stock import (
+    STOCK_SERIES_COLUMNS_RENAMER,
+    Stock,
+    StockResponse,
+    StockSeries,
+)
+from api.services.encoders import encode_stock_series
+from api.services.serializers import SerializerFactory
+
+STOCKS_BUCKET = "infra/data/stocks-bucket"
+
+
+def load_series(file_format: str, symbol: str) -> pd.DataFrame:
+    """Load a fixture series the same way StockService does."""
+    blob_path = os.path.join(
+        STOCKS_BUCKET, file_format, f"{symbol}.{file_format}"
+    )
+
+    with open(blob_path, "rb") as blob:
+        data = io.BytesIO(blob.read())
+
+    serializer = SerializerFactory().with_format(file_format).build()
+
+    return serializer.serialize(data, STOCK_SERIES_COLUMNS_RENAMER)
+
+
+def fixture_stock(file_format: str, symbol: str) -> Stock:
+    """Build stock metadata for a fixture series."""
+    return Stock(
+        id="000000000000000000000000",
+        company_name=symbol,
+        industry="BENCHMARK",
+        symbol=symbol,
+        series="EQ",
+        isin_code="INE000000000",
+        file_format=file_format,
+        created_at=datetime(2023, 10, 4),
+        last_updated=datetime(2023, 10, 4),
+    )
+
+
+def pydantic_encoding(stock: Stock, data: pd.DataFrame) -> bytes:
+    """Encode through StockSeries and StockResponse, as the route used to."""
+    response = StockResponse(
+        **stock.model_dump(), time_series=StockSeries.from_dataframe(data)
+    )
+    # FastAPI validates the returned model again before serializing it.
+    response = StockResponse.model_validate(response.model_dump())
+
+    return response.model_dump_json().encode()
+
+
+def fast_encoding(stock: Stock, data: pd.DataFrame) -> bytes:
+    """Encode straight from the DataFrame columns."""
+    return encode_stock_series(stock, data)
+
+
+def run(repeat: int, number: int) -> Dict[str, Dict[str, float]]:
+    """Time both encoding paths for one fixture of every format."""
+    encoders: Dict[str, Callable] = {
+        "pydantic": pydantic_encoding,
+        "fast": fast_encoding,
+    }
+
+    results = {}
+    for file_format in sorted(os.listdir(STOCKS_BUCKET)):
+        blob_names = sorted(
+            os.listdir(os.path.join(STOCKS_BUCKET, file_format))
+        )
+        symbol, _ = os.path.splitext(blob_names[0])
+
+        stock = fixture_stock(file_format, symbol)
+        data = load_series(file_format, symbol)
+
+        timings = {}
+        for name, encoder in encoders.items():
+            runs = timeit.repeat(
+                lambda: encoder(stock, data), repeat=repeat, number=number
+            )
+            timings[name] = min(runs) / number * 1000
+
+        results[f"{symbol}.{file_format}"] = timings
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark stock series JSON encoding."
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'series':<20}{'pydantic (ms)':>15}{'fast (ms)':>12}{'speedup':>10}"
+    )
+    for series, timings in run(args.repeat, args.number).items():
+        speedup = timings["pydantic"] / timings["fast"]
+        print(
+            f"{series:<20}{timings['pydantic']:>15.2f}"
+            f"{timings['fast']:>12.2f}{speedup:>9.1f}x"
+        )
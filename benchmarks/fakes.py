@@ -0,0 +1,95 @@
+import csv
+import os
+import posixpath
+from datetime import datetime, timezone
+from typing import BinaryIO, Optional
+
+import mongomock
+from pymongo.database import Database
+
+STOCKS_BUCKET = "infra/data/stocks-bucket"
+STOCK_METADATA = "infra/data/stock_metadata.csv"
+
+
+class LocalBlob:
+    """In-process stand-in for a storage Blob backed by a local file."""
+
+    def __init__(self, path: str, name: str) -> None:
+        self.path = path
+        self.name = name
+
+        if os.path.exists(path):
+            stat = os.stat(path)
+            self.generation = stat.st_mtime_ns
+            self.size = stat.st_size
+            self.updated = datetime.fromtimestamp(
+                stat.st_mtime, tz=timezone.utc
+            )
+            self.md5_hash = None
+            self.etag = str(self.generation)
+
+    def download_to_file(self, file_obj: BinaryIO) -> None:
+        """Write the blob content to a file object."""
+        with open(self.path, "rb") as blob_file:
+            file_obj.write(blob_file.read())
+
+    def download_as_bytes(
+        self, start: int = None, end: int = None, checksum: str = None
+    ) -> bytes:
+        """Read the blob content, or the inclusive byte range [start, end]."""
+        with open(self.path, "rb") as blob_file:
+            if start is None:
+                return blob_file.read()
+
+            blob_file.seek(start)
+            return blob_file.read(end - start + 1)
+
+
+class LocalBucket:
+    """In-process stand-in for a storage Bucket backed by a directory."""
+
+    def __init__(self, root: str) -> None:
+        self._root = root
+
+    def _path(self, blob_name: str) -> str:
+        return os.path.join(self._root, *blob_name.split(posixpath.sep))
+
+    def get_blob(self, blob_name: str) -> Optional[LocalBlob]:
+        """Get a blob, or None if it does not exist."""
+        path = self._path(blob_name)
+        if not os.path.isfile(path):
+            return None
+
+        return LocalBlob(path, blob_name)
+
+    def blob(self, blob_name: str, generation: int = None) -> LocalBlob:
+        """Get a blob reference, without checking it exists."""
+        return LocalBlob(self._path(blob_name), blob_name)
+
+
+class LocalStorageClient:
+    """In-process stand-in for a storage Client serving one directory."""
+
+    def __init__(self, root: str = STOCKS_BUCKET) -> None:
+        self._root = root
+
+    def bucket(self, bucket_name: str) -> LocalBucket:
+        """Get the bucket, every name maps to the same directory."""
+        return LocalBucket(self._root)
+
+
+def metadata_database(metadata_path: str = STOCK_METADATA) -> Database:
+    """Get an in-process Mongo database with the stock metadata loaded."""
+    database = mongomock.MongoClient()["stocks-benchmarks"]
+
+    with open(metadata_path, "r") as metadata_file:
+        stocks = list(csv.DictReader(metadata_file))
+
+    now = datetime.now()
+    for stock in stocks:
+        stock["created_at"] = now
+        stock["last_updated"] = now
+
+    database["stocks"].insert_many(stocks)
+
+    return database
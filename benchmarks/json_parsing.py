@@ -0,0 +1,72 @@
+import argparse
+import io
+import json
+import os
+import timeit
+from typing import Callable, Dict
+
+import pandas as pd
+
+from api.schemas.serializer import SerializerType
+from api.schemas.stock import STOCK_SERIES_COLUMNS_RENAMER
+from api.services.serializers import SerializerFactory
+
+JSON_SERIES = "infra/data/stocks-bucket/json"
+
+
+def json_load_parsing(data: bytes) -> pd.DataFrame:
+    """Parse as JsonSerializer used to: json.load and a DataFrame of dicts."""
+    json_dataframe = pd.DataFrame(json.load(io.BytesIO(data)))
+
+    return json_dataframe.rename(columns=STOCK_SERIES_COLUMNS_RENAMER)
+
+
+def columnar_parsing(data: bytes) -> pd.DataFrame:
+    """Parse with JsonSerializer, straight into typed columns."""
+    serializer = SerializerFactory().with_format(SerializerType.JSON).build()
+
+    return serializer.serialize(io.BytesIO(data), STOCK_SERIES_COLUMNS_RENAMER)
+
+
+def run(repeat: int, number: int) -> Dict[str, Dict[str, float]]:
+    """Time both parsers for every json fixture."""
+    parsers: Dict[str, Callable] = {
+        "json.load": json_load_parsing,
+        "columnar": columnar_parsing,
+    }
+
+    results = {}
+    for blob_name in sorted(os.listdir(JSON_SERIES)):
+        with open(os.path.join(JSON_SERIES, blob_name), "rb") as blob:
+            data = blob.read()
+
+        timings = {}
+        for name, parser in parsers.items():
+            runs = timeit.repeat(
+                lambda: parser(data), repeat=repeat, number=number
+            )
+            timings[name] = min(runs) / number * 1000
+
+        results[blob_name] = timings
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark stock series json parsing."
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'series':<20}{'json.load (ms)':>16}{'columnar (ms)':>15}"
+        f"{'speedup':>10}"
+    )
+    for series, timings in run(args.repeat, args.number).items():
+        speedup = timings["json.load"] / timings["columnar"]
+        print(
+            f"{series:<20}{timings['json.load']:>16.2f}"
+            f"{timings['columnar']:>15.2f}{speedup:>9.1f}x"
+        )
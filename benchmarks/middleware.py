@@ -0,0 +1,156 @@
+import argparse
+import asyncio
+import time
+from typing import AsyncIterator, Callable, Dict
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.middleware.base import (
+    BaseHTTPMiddleware,
+    RequestResponseEndpoint,
+)
+from starlette.responses import Response
+
+from api.middlewares.logging import RequestIdLoggingMiddleware
+from api.utils.metrics import observe_request, requests_in_flight, route_path
+from api.utils.request_id import (
+    get_request_id,
+    reset_current_request_id,
+    set_current_request_id,
+)
+from api.utils.timing import server_timing, start_timings, stop_timings
+
+STREAM_CHUNK = b"x" * 64 * 1024
+STREAM_CHUNKS = 16
+
+
+class BaseHTTPRequestIdLoggingMiddleware(BaseHTTPMiddleware):
+    """RequestIdLoggingMiddleware as it was on BaseHTTPMiddleware."""
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        """Middleware Dispatcher."""
+        request_id = get_request_id(request.headers.get("X-Request-ID"))
+        request_id_token = set_current_request_id(request_id)
+
+        start = time.perf_counter()
+        token = start_timings()
+        requests_in_flight.inc()
+        try:
+            response = await call_next(request)
+        finally:
+            requests_in_flight.dec()
+            timings = stop_timings(token)
+            reset_current_request_id(request_id_token)
+
+        timings["total"] = time.perf_counter() - start
+        observe_request(
+            request.method,
+            route_path(request.scope),
+            response.status_code,
+            timings["total"],
+        )
+        response.headers["X-Request-ID"] = request_id
+        response.headers["Server-Timing"] = server_timing(timings)
+
+        return response
+
+
+def build_app(middleware: type = None) -> FastAPI:
+    """Build an app with a small JSON and a streamed route."""
+    app = FastAPI()
+
+    @app.get("/json")
+    async def get_json() -> Response:
+        return ORJSONResponse({"symbol": "NTPC", "close": [1.0] * 100})
+
+    @app.get("/stream")
+    async def get_stream() -> Response:
+        async def _chunks() -> AsyncIterator[bytes]:
+            for _ in range(STREAM_CHUNKS):
+                yield STREAM_CHUNK
+
+        return StreamingResponse(_chunks())
+
+    if middleware is not None:
+        app.add_middleware(middleware)
+
+    return app
+
+
+async def throughput(
+    app: FastAPI, path: str, requests: int, concurrency: int
+) -> float:
+    """Serve `requests` requests, `concurrency` at a time, in requests/s."""
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://benchmarks"
+    ) as client:
+
+        async def _get() -> None:
+            async with semaphore:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        # Warm up routes and lazily created metrics.
+        await _get()
+
+        start = time.perf_counter()
+        await asyncio.gather(*[_get() for _ in range(requests)])
+
+        return requests / (time.perf_counter() - start)
+
+
+def run(
+    requests: int, concurrency: int, repeat: int
+) -> Dict[str, Dict[str, float]]:
+    """Measure the best throughput of every middleware on every route."""
+    middlewares: Dict[str, Callable] = {
+        "none": None,
+        "base_http": BaseHTTPRequestIdLoggingMiddleware,
+        "asgi": RequestIdLoggingMiddleware,
+    }
+
+    results = {}
+    for path in ("/json", "/stream"):
+        results[path] = {
+            name: max(
+                asyncio.run(
+                    throughput(
+                        build_app(middleware), path, requests, concurrency
+                    )
+                )
+                for _ in range(repeat)
+            )
+            for name, middleware in middlewares.items()
+        }
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the request id middleware throughput."
+    )
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'route':<10}{'none (req/s)':>14}{'base_http (req/s)':>19}"
+        f"{'asgi (req/s)':>14}{'speedup':>10}"
+    )
+    for path, results in run(
+        args.requests, args.concurrency, args.repeat
+    ).items():
+        speedup = results["asgi"] / results["base_http"]
+        print(
+            f"{path:<10}{results['none']:>14.0f}"
+            f"{results['base_http']:>19.0f}{results['asgi']:>14.0f}"
+            f"{speedup:>9.2f}x"
+        )
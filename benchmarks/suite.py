@@ -0,0 +1,305 @@
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import timeit
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow
+
+from api.repositories.stocks import StockMetadataRepository
+from api.schemas.serializer import SerializerType
+from api.schemas.stock import STOCK_SERIES_COLUMNS_RENAMER, StockSeries
+from api.services.serializers import Serializer, SerializerFactory
+from benchmarks.fakes import STOCKS_BUCKET, metadata_database
+
+Benchmark = Tuple[str, Callable[[], object]]
+
+
+def _fixture_symbol(file_format: str) -> str:
+    """Get the first fixture symbol of a format."""
+    blob_names = sorted(os.listdir(os.path.join(STOCKS_BUCKET, file_format)))
+    symbol, _ = os.path.splitext(blob_names[0])
+
+    return symbol
+
+
+def _fixture_data(file_format: str) -> bytes:
+    symbol = _fixture_symbol(file_format)
+    path = os.path.join(STOCKS_BUCKET, file_format, f"{symbol}.{file_format}")
+
+    with open(path, "rb") as blob:
+        return blob.read()
+
+
+def _parquet_data() -> bytes:
+    """Convert the csv fixture to parquet, as infra/convert.py does."""
+    dataframe = pd.read_csv(
+        io.BytesIO(_fixture_data(SerializerType.CSV.value))
+    )
+    dataframe["Date"] = pd.to_datetime(dataframe["Date"])
+
+    parquet_data = io.BytesIO()
+    dataframe.to_parquet(
+        parquet_data, engine="pyarrow", compression="zstd", index=False
+    )
+
+    return parquet_data.getvalue()
+
+
+def serializer_benchmarks() -> List[Benchmark]:
+    """Benchmark every Serializer on a fixture of its format."""
+    benchmarks = []
+    for file_format in SerializerType:
+        if file_format == SerializerType.PARQUET:
+            data = _parquet_data()
+        else:
+            data = _fixture_data(file_format.value)
+
+        serializer = SerializerFactory().with_format(file_format).build()
+
+        def _serialize(
+            serializer: Serializer = serializer, data: bytes = data
+        ) -> pd.DataFrame:
+            return serializer.serialize(
+                io.BytesIO(data), STOCK_SERIES_COLUMNS_RENAMER
+            )
+
+        benchmarks.append((f"serializer.{file_format.value}", _serialize))
+
+    return benchmarks
+
+
+def schema_benchmarks() -> List[Benchmark]:
+    """Benchmark building a StockSeries from a parsed series."""
+    data = (
+        SerializerFactory()
+        .with_format(SerializerType.CSV)
+        .build()
+        .serialize(
+            io.BytesIO(_fixture_data(SerializerType.CSV.value)),
+            STOCK_SERIES_COLUMNS_RENAMER,
+        )
+    )
+
+    return [
+        (
+            "schema.stock_series_from_dataframe",
+            lambda: StockSeries.from_dataframe(data.copy()),
+        )
+    ]
+
+
+def repository_benchmarks() -> List[Benchmark]:
+    """Benchmark listing stocks from an in-process Mongo."""
+    repository = StockMetadataRepository(metadata_database())
+    sort = [("company_name", 1)]
+
+    return [
+        ("repository.list", lambda: repository.list(0, 10, sort)),
+        (
+            "repository.list_without_total",
+            lambda: repository.list(0, 10, sort, include_total=False),
+        ),
+    ]
+
+
+def route_benchmarks() -> List[Benchmark]:
+    """Benchmark both stock routes end to end, on in-process fakes.
+
+    Series are read cold (without series, blob or sidecar cache) and warm
+    (from the series and blob caches).
+    """
+    os.environ.setdefault("MONGO_DATABASE", "stocks-benchmarks")
+    os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+    os.environ.setdefault("STOCKS_BUCKET", "stocks-bucket")
+    os.environ.setdefault("ENSURE_INDEXES_ON_STARTUP", "false")
+
+    from fastapi.testclient import TestClient
+
+    from api.dependencies.cache import (
+        get_blob_cache,
+        get_series_cache,
+        get_sidecar_cache,
+    )
+    from api.dependencies.database import get_database
+    from api.dependencies.storage import get_storage_client
+    from api.main import app
+    from api.services.cache import SeriesCache
+    from api.utils.ttl_cache import TTLCache
+    from benchmarks.fakes import LocalStorageClient
+
+    database = metadata_database()
+    storage_client = LocalStorageClient()
+    series_cache = SeriesCache(256 * 1024 * 1024)
+    blob_cache = TTLCache(60)
+
+    app.dependency_overrides[get_database] = lambda: database
+    app.dependency_overrides[get_storage_client] = lambda: storage_client
+    app.dependency_overrides[get_sidecar_cache] = lambda: None
+    client = TestClient(app)
+
+    def _get(path: str, cached: bool) -> None:
+        app.dependency_overrides[get_series_cache] = (
+            lambda: series_cache if cached else None
+        )
+        app.dependency_overrides[get_blob_cache] = (
+            lambda: blob_cache if cached else None
+        )
+        response = client.get(path)
+        response.raise_for_status()
+
+    benchmarks = [("route.list", lambda: _get("/api/v1/stocks", cached=False))]
+
+    for file_format in SerializerType:
+        stock = database["stocks"].find_one({"file_format": file_format.value})
+        if stock is None:
+            continue
+
+        path = f"/api/v1/stocks/{stock['_id']}"
+        benchmarks.append(
+            (
+                f"route.get.{file_format.value}",
+                lambda path=path: _get(path, cached=False),
+            )
+        )
+        benchmarks.append(
+            (
+                f"route.get.{file_format.value}.cached",
+                lambda path=path: _get(path, cached=True),
+            )
+        )
+
+    return benchmarks
+
+
+def measure(
+    benchmark: Callable[[], object], repeat: int, number: int
+) -> Dict[str, float]:
+    """Time a benchmark, in milliseconds per call."""
+    # Warm up imports, caches and lazily built objects.
+    benchmark()
+
+    runs = [
+        total / number * 1000
+        for total in timeit.repeat(benchmark, repeat=repeat, number=number)
+    ]
+
+    return {
+        "min_ms": min(runs),
+        "median_ms": statistics.median(runs),
+        "mean_ms": statistics.mean(runs),
+        "stdev_ms": statistics.stdev(runs) if len(runs) > 1 else 0.0,
+        "repeat": repeat,
+        "number": number,
+    }
+
+
+def environment() -> Dict[str, str]:
+    """Describe the environment results were measured on."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "pyarrow": pyarrow.__version__,
+    }
+
+
+def run(
+    repeat: int, number: int, only: List[str] = None
+) -> Dict[str, Dict[str, float]]:
+    """Run every benchmark, or the ones whose name starts with `only`."""
+    groups = [
+        serializer_benchmarks,
+        schema_benchmarks,
+        repository_benchmarks,
+        route_benchmarks,
+    ]
+
+    results = {}
+    for group in groups:
+        for name, benchmark in group():
+            if only and not any(name.startswith(prefix) for prefix in only):
+                continue
+
+            results[name] = measure(benchmark, repeat, number)
+
+    return results
+
+
+def print_results(
+    results: Dict[str, Dict[str, float]], baseline: Dict = None
+) -> None:
+    """Print results, with the change over `baseline` results if given."""
+    print(f"{'benchmark':<36}{'median (ms)':>12}{'min (ms)':>10}{'change':>9}")
+    for name, result in results.items():
+        change = ""
+        if baseline and name in baseline:
+            before = baseline[name]["median_ms"]
+            change = f"{(result['median_ms'] - before) / before:+.0%}"
+
+        print(
+            f"{name:<36}{result['median_ms']:>12.2f}"
+            f"{result['min_ms']:>10.2f}{change:>9}"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Run the stocks api benchmark suite on local fakes."
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=3)
+    parser.add_argument(
+        "--only",
+        action="append",
+        help="run benchmarks whose name starts with this, can be repeated",
+    )
+    parser.add_argument("--output", help="write json results to this file")
+    parser.add_argument(
+        "--compare", help="json results of a previous run to compare to"
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    results = run(args.repeat, args.number, args.only)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r") as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(
+                {"environment": environment(), "results": results},
+                output_file,
+                indent=2,
+            )
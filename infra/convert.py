@@ -0,0 +1,145 @@
+import argparse
+import json
+import logging
+import os
+import posixpath
+from datetime import datetime
+from io import BytesIO
+from typing import Dict
+
+import pandas as pd
+from google.auth.credentials import AnonymousCredentials
+from google.cloud.storage import Bucket, Client
+from pymongo import MongoClient
+from pymongo.collection import Collection
+
+COLLECTION_NAME = "stocks"
+PARQUET_FORMAT = "parquet"
+SOURCE_FORMATS = ["csv", "json", "xlsx"]
+
+
+def read_series(data: BytesIO, file_format: str) -> pd.DataFrame:
+    """Read a stock series blob in its source format."""
+    if file_format == "csv":
+        dataframe = pd.read_csv(data)
+    elif file_format == "json":
+        dataframe = pd.DataFrame(json.load(data))
+    elif file_format == "xlsx":
+        dataframe = pd.read_excel(data)
+    else:
+        raise ValueError(f"Unsupported file format [{file_format}].")
+
+    # Excel exports carry the original DataFrame index as a column.
+    index_columns = [c for c in dataframe.columns if c.startswith("Unnamed:")]
+    dataframe = dataframe.drop(columns=index_columns)
+    dataframe["Date"] = pd.to_datetime(dataframe["Date"])
+
+    return dataframe.reset_index(drop=True)
+
+
+def write_parquet(dataframe: pd.DataFrame) -> BytesIO:
+    """Write a stock series as a parquet buffer."""
+    buffered_data = BytesIO()
+    dataframe.to_parquet(
+        buffered_data, engine="pyarrow", compression="zstd", index=False
+    )
+    buffered_data.seek(0)
+
+    return buffered_data
+
+
+def convert_stock(
+    bucket: Bucket, collection: Collection, stock: Dict, dry_run: bool
+) -> int:
+    """Convert a stock series to parquet and point its metadata to it.
+
+    Returns the size in bytes of the written parquet blob.
+    """
+    symbol = stock["symbol"]
+    file_format = stock["file_format"]
+
+    source_blob = bucket.blob(
+        posixpath.join(file_format, f"{symbol}.{file_format}")
+    )
+    source_data = BytesIO(source_blob.download_as_bytes())
+
+    parquet_data = write_parquet(read_series(source_data, file_format))
+    parquet_size = parquet_data.getbuffer().nbytes
+
+    if dry_run:
+        return parquet_size
+
+    target_blob = bucket.blob(
+        posixpath.join(PARQUET_FORMAT, f"{symbol}.{PARQUET_FORMAT}")
+    )
+    target_blob.upload_from_file(
+        parquet_data, content_type="application/vnd.apache.parquet"
+    )
+
+    collection.update_one(
+        {"_id": stock["_id"]},
+        {
+            "$set": {
+                "file_format": PARQUET_FORMAT,
+                "last_updated": datetime.now(),
+            }
+        },
+    )
+
+    return parquet_size
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Convert stock series blobs to parquet."
+    )
+    parser.add_argument(
+        "--bucket",
+        default=os.getenv("STOCKS_BUCKET", "stocks-bucket"),
+        help="stocks bucket name",
+    )
+    parser.add_argument(
+        "--symbol",
+        action="append",
+        dest="symbols",
+        help="convert only the given symbol, can be repeated",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="convert without uploading blobs or updating metadata",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+
+    mongo_client = MongoClient(os.getenv("MONGO_URI"), connect=False)
+    database = mongo_client.get_database(os.getenv("MONGO_DATABASE"))
+    mongo_collection = database.get_collection(COLLECTION_NAME)
+
+    storage_client = Client(credentials=AnonymousCredentials())
+    bucket = storage_client.bucket(args.bucket)
+
+    stocks_filter = {"file_format": {"$in": SOURCE_FORMATS}}
+    if args.symbols:
+        stocks_filter["symbol"] = {"$in": args.symbols}
+
+    logging.info("converting stock series to parquet...")
+    for stock in mongo_collection.find(stocks_filter):
+        try:
+            size = convert_stock(bucket, mongo_collection, stock, args.dry_run)
+        except Exception as e:
+            logging.error(
+                f"could not convert stock [{stock['symbol']}]. Error [{e}]."
+            )
+            continue
+
+        logging.info(
+            f"converted stock [{stock['symbol']}] from "
+            f"[{stock['file_format']}] to parquet ({size} bytes)"
+        )
@@ -1,79 +1,321 @@
+import argparse
+import base64
 import csv
+import hashlib
 import logging
 import os
+import posixpath
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from bson import ObjectId
-from pydantic import BaseModel
-from pymongo import MongoClient
+import requests
+from google.auth.credentials import AnonymousCredentials
+from google.cloud.storage import Bucket, Client
+from pymongo import ASCENDING, DESCENDING, MongoClient, UpdateOne
 from pymongo.collection import Collection
+from requests.adapters import HTTPAdapter
 
 COLLECTION_NAME = "stocks"
 STOCK_METADATA = "infra/data/stock_metadata.csv"
+STOCKS_BUCKET_DATA = "infra/data/stocks-bucket"
+PARQUET_FORMAT = "parquet"
 
+CONTENT_TYPES = {
+    "csv": "text/csv",
+    "json": "application/json",
+    "parquet": "application/vnd.apache.parquet",
+    "xlsx": (
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    ),
+}
 
-class Stock(BaseModel):
-    """Stock base model."""
 
-    id: Optional[str]
-    company_name: str
-    industry: str
-    symbol: str
-    series: str
-    isin_code: str
-    file_format: str
-    created_at: Optional[datetime]
-    last_updated: Optional[datetime]
+def serialize_csv(csv_path: str) -> List[Dict]:
+    """Serialize csv to a Dict."""
+    with open(csv_path, "r") as csv_file:
+        return list(csv.DictReader(csv_file))
 
-    @classmethod
-    def from_dict(cls, data: Dict):  # noqa
-        data["id"] = str(data["_id"])
-        return Stock(**data)
 
+def stock_upsert(
+    doc: Dict, stored: Optional[Dict], now: datetime
+) -> Optional[UpdateOne]:
+    """Build the upsert of a stock metadata document keyed on its symbol.
 
-def serialize_csv(csv_path: str) -> List[Dict]:
-    """Serialize csv to a Dict."""
-    csv_file = open(csv_path, "r")
-    reader = csv.DictReader(csv_file)
+    New stocks are inserted with `created_at` and `last_updated`. Stored
+    stocks are only updated, and `last_updated` bumped, when a field
+    differs from `stored`, so reruns leave unchanged stocks as they are.
+    The file format of stocks converted to parquet is kept. Returns None
+    when there is nothing to write.
+    """
+    if stored is None:
+        return UpdateOne(
+            {"symbol": doc["symbol"]},
+            {"$setOnInsert": {**doc, "created_at": now, "last_updated": now}},
+            upsert=True,
+        )
+
+    changes = {
+        field: value
+        for field, value in doc.items()
+        if stored.get(field) != value
+        and not (
+            field == "file_format"
+            and stored.get("file_format") == PARQUET_FORMAT
+        )
+    }
+
+    if not changes:
+        return None
+
+    return UpdateOne(
+        {"_id": stored["_id"]},
+        {"$set": {**changes, "last_updated": now}},
+    )
+
+
+def remove_duplicate_stocks(collection: Collection, dry_run: bool) -> int:
+    """Remove the stocks of a symbol but the last updated one.
+
+    Databases loaded before stocks were upserted by symbol can hold
+    duplicates, which would fail the creation of the unique symbol index.
+    The kept stock is the one with the latest `last_updated` (the first
+    inserted one among equals), which carries the latest metadata, file
+    format and summary. With `dry_run`, duplicates are only reported.
+    Returns the number of duplicated stocks.
+    """
+    duplicates = collection.aggregate(
+        [
+            {"$sort": {"last_updated": DESCENDING, "_id": ASCENDING}},
+            {"$group": {"_id": "$symbol", "ids": {"$push": "$_id"}}},
+            {"$match": {"ids.1": {"$exists": True}}},
+        ]
+    )
+
+    duplicate_ids = []
+    for duplicate in duplicates:
+        kept_id, removed_ids = duplicate["ids"][0], duplicate["ids"][1:]
+        action = "Would remove" if dry_run else "Removing"
+        logging.warning(
+            f"{action} stocks {[str(id) for id in removed_ids]} of symbol "
+            f"[{duplicate['_id']}], keeping stock [{kept_id}]."
+        )
+        duplicate_ids += removed_ids
+
+    if duplicate_ids and not dry_run:
+        collection.delete_many({"_id": {"$in": duplicate_ids}})
+
+    return len(duplicate_ids)
+
+
+def load_metadata(
+    collection: Collection,
+    docs: List[Dict],
+    batch_size: int,
+    dedupe: bool = False,
+) -> Tuple[int, int]:
+    """Upsert stock metadata with unordered bulk writes.
+
+    The unique symbol index is created first. Duplicated stocks, which
+    would fail it, are removed if `dedupe`, and only reported otherwise, in
+    which case the index is not created. Returns the number of inserted and
+    of updated stocks.
+    """
+    duplicates = remove_duplicate_stocks(collection, dry_run=not dedupe)
+
+    if duplicates and not dedupe:
+        logging.error(
+            f"Found [{duplicates}] duplicated stocks, the unique symbol "
+            "index is not created. Rerun with --dedupe to remove them."
+        )
+    else:
+        collection.create_index(
+            [("symbol", ASCENDING)], name="symbol", unique=True
+        )
+
+    now = datetime.now()
+    inserted, updated = 0, 0
+    for start in range(0, len(docs), batch_size):
+        end = start + batch_size
+        batch = docs[start:end]
+        stored = {
+            stock["symbol"]: stock
+            for stock in collection.find(
+                {"symbol": {"$in": [doc["symbol"] for doc in batch]}}
+            )
+        }
+
+        upserts = [
+            upsert
+            for upsert in (
+                stock_upsert(doc, stored.get(doc["symbol"]), now)
+                for doc in batch
+            )
+            if upsert is not None
+        ]
+
+        if not upserts:
+            continue
+
+        result = collection.bulk_write(upserts, ordered=False)
+        inserted += result.upserted_count
+        updated += result.modified_count
 
-    serialized_obj = []
-    for line in reader:
-        serialized_obj.append(line)
+    return inserted, updated
 
-    return serialized_obj
 
+def _md5_hash(path: str) -> str:
+    md5 = hashlib.md5()
+    with open(path, "rb") as blob_file:
+        for chunk in iter(lambda: blob_file.read(1024 * 1024), b""):
+            md5.update(chunk)
 
-def _get_by_id(collection: Collection, doc_id: str) -> Dict:
-    return collection.find_one({"_id": ObjectId(doc_id)})
+    return base64.b64encode(md5.digest()).decode()
 
 
-def insert_document(collection: Collection, doc: Dict) -> Stock:
-    """Insert a document in mongo."""
-    doc["created_at"] = datetime.now()
-    doc["last_updated"] = datetime.now()
-    result = collection.insert_one(doc)
-    inserted_doc = _get_by_id(collection, result.inserted_id)
-    return Stock.from_dict(inserted_doc)
+def upload_blob(bucket: Bucket, path: str, blob_name: str) -> int:
+    """Upload a series file unless the blob already has the same content.
+
+    Returns the number of bytes uploaded.
+    """
+    blob = bucket.get_blob(blob_name)
+    if blob is not None and blob.md5_hash == _md5_hash(path):
+        return 0
+
+    _, extension = os.path.splitext(blob_name)
+    bucket.blob(blob_name).upload_from_filename(
+        path, content_type=CONTENT_TYPES.get(extension.lstrip("."))
+    )
+
+    return os.path.getsize(path)
+
+
+def list_series_files(data_dir: str) -> List[Tuple[str, str]]:
+    """List the series files of a local bucket copy and their blob names."""
+    series_files = []
+    for root, _, files in os.walk(data_dir):
+        for file_name in sorted(files):
+            path = os.path.join(root, file_name)
+            blob_name = posixpath.join(
+                *os.path.relpath(path, data_dir).split(os.sep)
+            )
+            series_files.append((path, blob_name))
+
+    return series_files
+
+
+def upload_series(
+    bucket: Bucket, series_files: List[Tuple[str, str]], workers: int
+) -> Tuple[int, int]:
+    """Upload or refresh series blobs on a pool of `workers` threads.
+
+    Returns the number of uploaded blobs and of uploaded bytes.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        uploaded = list(
+            executor.map(
+                lambda series_file: upload_blob(bucket, *series_file),
+                series_files,
+            )
+        )
+
+    return sum(1 for size in uploaded if size), sum(uploaded)
+
+
+def storage_client(pool_size: int) -> Client:
+    """Get a storage Client with a connection pool for every worker."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return Client(credentials=AnonymousCredentials(), _http=session)
+
+
+def report(phase: str, count: int, unit: str, elapsed: float) -> None:
+    """Print the throughput of a loader phase."""
+    rate = count / elapsed if elapsed else 0.0
+    print(f"{phase}: {count} {unit} in {elapsed:.2f}s ({rate:.1f} {unit}/s)")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Load stock metadata and upload stock series blobs."
+    )
+    parser.add_argument(
+        "--bucket",
+        default=os.getenv("STOCKS_BUCKET", "stocks-bucket"),
+        help="stocks bucket name",
+    )
+    parser.add_argument(
+        "--metadata",
+        default=STOCK_METADATA,
+        help="stock metadata csv",
+    )
+    parser.add_argument(
+        "--data-dir",
+        default=STOCKS_BUCKET_DATA,
+        help="local copy of the stocks bucket",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=16,
+        help="parallel blob uploads",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="stocks per bulk write",
+    )
+    parser.add_argument(
+        "--skip-blobs",
+        action="store_true",
+        help="only load stock metadata",
+    )
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="remove duplicated stocks, only reported otherwise",
+    )
+
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+
     mongo_client = MongoClient(os.getenv("MONGO_URI"), connect=False)
     database = mongo_client.get_database(os.getenv("MONGO_DATABASE"))
-    logging.info("creating collections...")
-
-    try:
-        database.create_collection(COLLECTION_NAME)
-    except Exception:
-        pass
-
-    global mongo_collection
     mongo_collection = database.get_collection(COLLECTION_NAME)
 
-    stock_metadata = serialize_csv(STOCK_METADATA)
+    logging.info("loading stocks...")
+    start = time.perf_counter()
+    stock_metadata = serialize_csv(args.metadata)
+    inserted, updated = load_metadata(
+        mongo_collection, stock_metadata, args.batch_size, args.dedupe
+    )
+    report(
+        "metadata", len(stock_metadata), "stocks", time.perf_counter() - start
+    )
+    logging.info(f"inserted [{inserted}] and updated [{updated}] stocks")
 
-    logging.info("inserting stocks...")
-    for stock in stock_metadata:
-        _stock = insert_document(mongo_collection, stock)
+    if not args.skip_blobs:
+        logging.info("uploading stock series...")
+        start = time.perf_counter()
+        bucket = storage_client(args.workers).bucket(args.bucket)
+        series_files = list_series_files(args.data_dir)
+        uploaded, uploaded_bytes = upload_series(
+            bucket, series_files, args.workers
+        )
+        elapsed = time.perf_counter() - start
 
-        logging.info(f"inserted stock with id [{_stock.id}]")
+        report("series", len(series_files), "blobs", elapsed)
+        report("series upload", uploaded_bytes // 1024, "KiB", elapsed)
+        logging.info(
+            f"uploaded [{uploaded}] of [{len(series_files)}] series blobs"
+        )
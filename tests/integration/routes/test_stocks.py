@@ -1,6 +1,16 @@
+import asyncio
+import base64
+import json
+
+import msgpack
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pytest
 from numpy import nan
 
+from api.commands.summaries import build_service, summarize_stocks
+from api.repositories.stocks import StockMetadataRepository
 from tests.integration.base import BaseTest
 
 
@@ -258,3 +268,486 @@ class TestStocksRoutes(BaseTest):
         assert stock_data.get("isin_code") == expected_stock["isin_code"]
         assert stock_data.get("file_format") == expected_stock["file_format"]
         assert stock_time_series == expected_time_series
+
+    def test_get_stock_data__with_date_range_and_fields_query_parameters__expected_success_projected_series(  # noqa
+        self,
+    ) -> None:
+        """Test to get stock by id.
+
+        Query parameters with start, end and fields.
+        """
+        # FIXTURE
+        expected_time_series = (
+            pd.read_csv(
+                "tests/integration/data/stocks-bucket/csv/NESTLEIND.csv"
+            )
+            .replace({nan: None})
+            .rename(columns=self.STOCK_SERIES_RENAMER)
+        )
+        expected_time_series = expected_time_series[
+            (expected_time_series["date"] >= "2010-01-01")
+            & (expected_time_series["date"] <= "2010-03-31")
+        ][["date", "open", "close"]]
+        expected_time_series["date"] = pd.to_datetime(
+            expected_time_series["date"]
+        ).dt.strftime("%Y-%m-%dT%H:%M:%S")
+        expected_time_series = expected_time_series.to_dict(orient="list")
+
+        # EXERCISE
+        response = self.app_client.get("/api/v1/stocks?sort=-company_name")
+        stock_id = response.json().get("stocks")[0].get("id")
+
+        get_stock_response = self.app_client.get(
+            f"/api/v1/stocks/{stock_id}"
+            "?start=2010-01-01&end=2010-03-31&fields=open,close"
+        )
+        stock_data = get_stock_response.json()
+
+        # ASSERT
+        assert get_stock_response.is_success
+        assert stock_data.get("time_series") == expected_time_series
+
+    def test_get_stock_data__with_invalid_fields_query_parameter__expected_bad_request(  # noqa
+        self,
+    ) -> None:
+        """Test to get stock by id with an unknown series field."""
+        # EXERCISE
+        response = self.app_client.get("/api/v1/stocks?sort=-company_name")
+        stock_id = response.json().get("stocks")[0].get("id")
+
+        get_stock_response = self.app_client.get(
+            f"/api/v1/stocks/{stock_id}?fields=open,unknown"
+        )
+
+        # ASSERT
+        assert get_stock_response.status_code == 400
+
+    def test_get_stock_aggregate__yearly_interval__expected_success_aggregated_series(  # noqa
+        self,
+    ) -> None:
+        """Test to get a stock time series aggregated by year."""
+        # FIXTURE
+        stock_series = pd.read_csv(
+            "tests/integration/data/stocks-bucket/csv/NESTLEIND.csv"
+        ).rename(columns=self.STOCK_SERIES_RENAMER)
+        stock_series["date"] = pd.to_datetime(stock_series["date"])
+        first_year = stock_series[stock_series["date"].dt.year == 2010]
+
+        expected_first_period = {
+            "date": "2010-12-31T00:00:00",
+            "open": first_year["open"].iloc[0],
+            "high": first_year["high"].max(),
+            "low": first_year["low"].min(),
+            "close": first_year["close"].iloc[-1],
+            "volume": int(first_year["volume"].sum()),
+            "vwap": (first_year["vwap"] * first_year["volume"]).sum()
+            / first_year["volume"].sum(),
+            "turnover": first_year["turnover"].sum(),
+        }
+
+        # EXERCISE
+        response = self.app_client.get("/api/v1/stocks?sort=-company_name")
+        stock_id = response.json().get("stocks")[0].get("id")
+
+        aggregate_response = self.app_client.get(
+            f"/api/v1/stocks/{stock_id}/aggregate?interval=Y"
+        )
+        aggregate_data = aggregate_response.json()
+
+        # ASSERT
+        assert aggregate_response.is_success
+
+        time_series = aggregate_data.get("time_series")
+        first_period = {
+            field: values[0] for field, values in time_series.items()
+        }
+
+        assert aggregate_data.get("interval") == "Y"
+        assert (
+            len(time_series["date"]) == stock_series["date"].dt.year.nunique()
+        )
+        assert first_period == pytest.approx(expected_first_period)
+
+    def test_get_stock_data__with_stream_query_parameter__expected_success_ndjson_rows(  # noqa
+        self,
+    ) -> None:
+        """Test to stream a stock time series as newline delimited JSON."""
+        # FIXTURE
+        expected_time_series = (
+            pd.read_csv(
+                "tests/integration/data/stocks-bucket/csv/NESTLEIND.csv"
+            )
+            .replace({nan: None})
+            .rename(columns=self.STOCK_SERIES_RENAMER)
+        )
+        expected_time_series["date"] = pd.to_datetime(
+            expected_time_series["date"]
+        ).dt.strftime("%Y-%m-%dT%H:%M:%S")
+        expected_rows = expected_time_series.to_dict(orient="records")
+
+        # EXERCISE
+        response = self.app_client.get("/api/v1/stocks?sort=-company_name")
+        stock_id = response.json().get("stocks")[0].get("id")
+
+        stream_response = self.app_client.get(
+            f"/api/v1/stocks/{stock_id}?stream=true"
+        )
+
+        # ASSERT
+        assert stream_response.is_success
+        assert stream_response.headers["content-type"] == (
+            "application/x-ndjson"
+        )
+
+        rows = [json.loads(line) for line in stream_response.iter_lines()]
+
+        assert rows == expected_rows
+
+    def test_get_stock_data__with_matching_if_none_match_header__expected_not_modified(  # noqa
+        self,
+    ) -> None:
+        """Test a conditional GET of an unchanged series returns 304."""
+        # FIXTURE
+        response = self.app_client.get("/api/v1/stocks?sort=-company_name")
+        stock_id = response.json().get("stocks")[0].get("id")
+
+        stock_response = self.app_client.get(f"/api/v1/stocks/{stock_id}")
+        etag = stock_response.headers["etag"]
+
+        # EXERCISE
+        conditional_response = self.app_client.get(
+            f"/api/v1/stocks/{stock_id}", headers={"If-None-Match": etag}
+        )
+        projected_response = self.app_client.get(
+            f"/api/v1/stocks/{stock_id}?fields=close",
+            headers={"If-None-Match": etag},
+        )
+
+        # ASSERT
+        assert stock_response.is_success
+        assert "last-modified" in stock_response.headers
+
+        assert conditional_response.status_code == 304
+        assert conditional_response.headers["etag"] == etag
+        assert not conditional_response.content
+
+        assert projected_response.is_success
+        assert projected_response.headers["etag"] != etag
+
+    def test_get_stock_data__any_stock__expected_success_with_server_timing(  # noqa
+        self,
+    ) -> None:
+        """Test a series response has the time of each request stage."""
+        # FIXTURE
+        response = self.app_client.get("/api/v1/stocks?sort=-company_name")
+        stock_id = response.json().get("stocks")[0].get("id")
+
+        # EXERCISE
+        stock_response = self.app_client.get(f"/api/v1/stocks/{stock_id}")
+
+        # ASSERT
+        assert stock_response.is_success
+
+        stages = [
+            metric.split(";")[0]
+            for metric in stock_response.headers["server-timing"].split(", ")
+        ]
+
+        for expected_stage in ("mongo", "encoding", "total"):
+            assert expected_stage in stages
+
+    @pytest.mark.parametrize("symbol", ["NESTLEIND", "GRASIM"])
+    def test_get_stock_data__accept_arrow_and_msgpack__expected_success_same_series_as_json(  # noqa
+        self, symbol: str
+    ) -> None:
+        """Test binary series formats hold the same values as the JSON.
+
+        Series stored as csv and as xlsx, whose dates are parsed as strings.
+        """
+        # FIXTURE
+        response = self.app_client.get("/api/v1/stocks")
+        stock_id = next(
+            stock.get("id")
+            for stock in response.json().get("stocks")
+            if stock.get("symbol") == symbol
+        )
+
+        json_response = self.app_client.get(
+            f"/api/v1/stocks/{stock_id}?fields=close,volume"
+        )
+        expected_time_series = json_response.json()["time_series"]
+
+        # EXERCISE
+        arrow_response = self.app_client.get(
+            f"/api/v1/stocks/{stock_id}?fields=close,volume",
+            headers={"Accept": "application/vnd.apache.arrow.stream"},
+        )
+        msgpack_response = self.app_client.get(
+            f"/api/v1/stocks/{stock_id}?fields=close,volume",
+            headers={"Accept": "application/msgpack"},
+        )
+
+        # ASSERT
+        assert arrow_response.is_success
+        assert arrow_response.headers["content-type"] == (
+            "application/vnd.apache.arrow.stream"
+        )
+
+        arrow_table = pa.ipc.open_stream(arrow_response.content).read_all()
+        arrow_stock = json.loads(arrow_table.schema.metadata[b"stock"])
+
+        assert arrow_stock["symbol"] == symbol
+        assert arrow_table.column_names == ["date", "close", "volume"]
+        assert arrow_table.schema.field("date").type == pa.timestamp("ns")
+        assert arrow_table.schema.field("volume").type == pa.int64()
+        assert (
+            arrow_table.column("date")
+            .to_numpy()
+            .astype("datetime64[s]")
+            .astype(str)
+            .tolist()
+            == expected_time_series["date"]
+        )
+        assert arrow_table.column("close").to_pylist() == (
+            expected_time_series["close"]
+        )
+        assert arrow_table.column("volume").to_pylist() == (
+            expected_time_series["volume"]
+        )
+
+        assert msgpack_response.is_success
+        assert msgpack_response.headers["content-type"] == (
+            "application/msgpack"
+        )
+
+        content = msgpack.unpackb(msgpack_response.content)
+        close = content["time_series"]["close"]
+        dates = content["time_series"]["date"]
+
+        assert content["symbol"] == symbol
+        assert (
+            np.frombuffer(close["data"], dtype=close["dtype"]).tolist()
+            == expected_time_series["close"]
+        )
+        assert (
+            np.frombuffer(dates["data"], dtype=dates["dtype"])
+            .astype("datetime64[s]")
+            .astype(str)
+            .tolist()
+            == expected_time_series["date"]
+        )
+
+    def test_get_stocks__after_summarizing_stock__expected_success_stock_with_summary(  # noqa
+        self,
+    ) -> None:
+        """Test listed stocks include their precomputed series summary."""
+        # FIXTURE
+        stock_series = pd.read_csv(
+            "tests/integration/data/stocks-bucket/csv/NESTLEIND.csv"
+        ).rename(columns=self.STOCK_SERIES_RENAMER)
+        dates = pd.to_datetime(stock_series["date"])
+        window = stock_series[dates > dates.max() - pd.DateOffset(weeks=52)]
+
+        expected_summary = {
+            "as_of": dates.max().strftime("%Y-%m-%dT%H:%M:%S"),
+            "last_close": stock_series["close"].iloc[-1],
+            "high_52_weeks": window["high"].max(),
+            "low_52_weeks": window["low"].min(),
+            "average_volume_52_weeks": pytest.approx(window["volume"].mean()),
+        }
+
+        stock_metadata_repository = StockMetadataRepository(self.database)
+
+        # EXERCISE
+        failed = asyncio.run(
+            summarize_stocks(
+                stock_metadata_repository,
+                build_service(stock_metadata_repository),
+                "NESTLEIND",
+            )
+        )
+
+        response = self.app_client.get("/api/v1/stocks?sort=-company_name")
+
+        # ASSERT
+        assert failed == 0
+        assert response.is_success
+
+        stocks = response.json().get("stocks")
+
+        assert stocks[0]["summary"] == expected_summary
+        assert all("summary" not in stock for stock in stocks[1:])
+
+    def test_get_stocks__paginate_with_next_cursor__expected_success_all_stocks_in_order(  # noqa
+        self,
+    ) -> None:
+        """Test to get stocks.
+
+        Query parameters with cursor, following next_cursor until the last
+        page.
+        """
+        # FIXTURE
+        response = self.app_client.get("/api/v1/stocks?sort=-symbol")
+        expected_symbols = [
+            stock.get("symbol") for stock in response.json().get("stocks")
+        ]
+
+        # EXERCISE
+        symbols = []
+        pages = 0
+        query = "/api/v1/stocks?sort=-symbol&limit=4"
+        while query:
+            page_response = self.app_client.get(query)
+            assert page_response.is_success
+
+            page = page_response.json()
+            symbols += [stock.get("symbol") for stock in page.get("stocks")]
+            pages += 1
+
+            query = None
+            if page.get("next_cursor"):
+                query = (
+                    "/api/v1/stocks?sort=-symbol&limit=4"
+                    f"&cursor={page.get('next_cursor')}"
+                )
+
+        # ASSERT
+        assert pages == 2
+        assert symbols == expected_symbols
+
+    @pytest.mark.parametrize("sort", ["last_updated", "-last_updated"])
+    def test_get_stocks__paginate_with_next_cursor_over_null_values__expected_success_all_stocks_in_order(  # noqa
+        self, sort: str
+    ) -> None:
+        """Test to get stocks.
+
+        Query parameters with cursor, sorted by a field that is null for
+        some stocks, following next_cursor until the last page.
+        """
+        # FIXTURE
+        for symbol in ("ASIANPAINT", "HCLTECH"):
+            self.stocks_collection.update_one(
+                {"symbol": symbol}, {"$set": {"last_updated": None}}
+            )
+
+        response = self.app_client.get(f"/api/v1/stocks?sort={sort}")
+        expected_symbols = [
+            stock.get("symbol") for stock in response.json().get("stocks")
+        ]
+
+        # EXERCISE
+        symbols = []
+        query = f"/api/v1/stocks?sort={sort}&limit=1"
+        while query:
+            page_response = self.app_client.get(query)
+            assert page_response.is_success
+
+            page = page_response.json()
+            symbols += [stock.get("symbol") for stock in page.get("stocks")]
+
+            query = None
+            if page.get("next_cursor"):
+                query = (
+                    f"/api/v1/stocks?sort={sort}&limit=1"
+                    f"&cursor={page.get('next_cursor')}"
+                )
+
+        # ASSERT
+        assert len(expected_symbols) == 6
+        assert symbols == expected_symbols
+
+    def test_get_stocks__with_malformed_cursor__expected_bad_request(
+        self,
+    ) -> None:
+        """Test to get stocks with a malformed cursor."""
+        # EXERCISE
+        response = self.app_client.get("/api/v1/stocks?cursor=malformed")
+
+        # ASSERT
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize(
+        "value", ['{"$oid": "zz"}', '{"$regex": "."}', '{"$gt": ""}']
+    )
+    def test_get_stocks__with_cursor_value_not_a_sort_value__expected_bad_request(  # noqa
+        self, value: str
+    ) -> None:
+        """Test to get stocks with a cursor holding an invalid sort value."""
+        # FIXTURE
+        response = self.app_client.get("/api/v1/stocks?sort=symbol")
+        stock_id = response.json().get("stocks")[0].get("id")
+
+        cursor = base64.urlsafe_b64encode(
+            (
+                '{"field": "symbol", "order": 1, '
+                f'"value": {value}, "id": "{stock_id}"}}'
+            ).encode()
+        ).decode()
+
+        # EXERCISE
+        response = self.app_client.get(
+            "/api/v1/stocks", params={"sort": "symbol", "cursor": cursor}
+        )
+
+        # ASSERT
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize(
+        "sort", ["symbolx", "-symbol2", "company_name ", "--symbol", "id"]
+    )
+    def test_get_stocks__with_unknown_sort_field__expected_bad_request(
+        self, sort: str
+    ) -> None:
+        """Test to get stocks sorted by a field that is not sortable."""
+        # EXERCISE
+        response = self.app_client.get("/api/v1/stocks", params={"sort": sort})
+
+        # ASSERT
+        assert response.status_code == 400
+
+    def test_get_stocks__with_include_total_false_query_parameter__expected_success_without_total(  # noqa
+        self,
+    ) -> None:
+        """Test to get stocks without counting them."""
+        # EXERCISE
+        response = self.app_client.get("/api/v1/stocks?include_total=false")
+
+        # ASSERT
+        assert response.is_success
+
+        stock_response = response.json()
+
+        assert len(stock_response.get("stocks")) == 6
+        assert stock_response.get("total") is None
+
+    def test_get_stocks_series__with_many_ids__expected_success_series_by_id(  # noqa
+        self,
+    ) -> None:
+        """Test to get many stocks with their time series by ids."""
+        # FIXTURE
+        response = self.app_client.get("/api/v1/stocks")
+        stocks = response.json().get("stocks")
+        stock_ids = [stock.get("id") for stock in stocks]
+        unknown_id = "000000000000000000000000"
+
+        # EXERCISE
+        batch_response = self.app_client.get(
+            "/api/v1/stocks/series?fields=close"
+            f"&ids={','.join(stock_ids + [unknown_id])}"
+        )
+        batch_data = batch_response.json()
+
+        # ASSERT
+        assert batch_response.is_success
+        assert batch_data.get("not_found") == [unknown_id]
+        assert list(batch_data.get("stocks")) == stock_ids
+
+        for stock in stocks:
+            stock_response = self.app_client.get(
+                f"/api/v1/stocks/{stock.get('id')}?fields=close"
+            )
+
+            assert (
+                batch_data.get("stocks").get(stock.get("id"))
+                == stock_response.json()
+            )
@@ -0,0 +1,46 @@
+import io
+import json
+import logging
+
+from api.config.logging import configure_logging
+from api.utils.request_id import (
+    reset_current_request_id,
+    set_current_request_id,
+)
+
+
+class TestLogging:
+    """Test class to test the logging pipeline."""
+
+    def test_configure_logging__json_lines__expected_request_id_and_timings_written(  # noqa
+        self,
+    ) -> None:
+        """Test queued records are written as JSON lines by the listener."""
+        # FIXTURE
+        root_logger = logging.getLogger()
+        root_handlers, root_level = root_logger.handlers, root_logger.level
+        stream = io.StringIO()
+
+        # EXERCISE
+        listener = configure_logging("INFO", json_lines=True, stream=stream)
+        token = set_current_request_id("request-1")
+        try:
+            logging.info("served", extra={"timings": {"parse": 0.0125}})
+            logging.debug("not written")
+        finally:
+            reset_current_request_id(token)
+            listener.stop()
+            root_logger.handlers = root_handlers
+            root_logger.setLevel(root_level)
+
+        # ASSERT
+        lines = stream.getvalue().splitlines()
+
+        assert len(lines) == 1
+
+        entry = json.loads(lines[0])
+
+        assert entry["level"] == "INFO"
+        assert entry["request_id"] == "request-1"
+        assert entry["message"] == "served"
+        assert entry["timings_ms"] == {"parse": 12.5}
@@ -0,0 +1,77 @@
+import logging
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.config.logging import RequestIdFilter
+from api.middlewares.logging import RequestIdLoggingMiddleware
+from api.utils.request_id import get_current_request_id
+
+
+class TestRequestIdLoggingMiddleware:
+    """Test class to test the request id middleware."""
+
+    def test_request__with_x_request_id_header__expected_request_id_propagated_and_echoed(  # noqa
+        self,
+    ) -> None:
+        """Test the incoming request id is reused, logged and echoed."""
+        # FIXTURE
+        app = FastAPI()
+        request_ids = []
+
+        @app.get("/tests")
+        def get_test() -> dict:
+            record = logging.LogRecord(
+                "tests", logging.INFO, __file__, 0, "test", None, None
+            )
+            RequestIdFilter().filter(record)
+            request_ids.append(record.request_id)
+
+            return {}
+
+        app.add_middleware(RequestIdLoggingMiddleware)
+        client = TestClient(app)
+
+        # EXERCISE
+        response = client.get("/tests", headers={"X-Request-ID": "upstream"})
+        new_id_response = client.get("/tests")
+
+        # ASSERT
+        assert response.is_success
+        assert response.headers["x-request-id"] == "upstream"
+        assert new_id_response.headers["x-request-id"] not in ("", "upstream")
+        assert request_ids == [
+            "upstream",
+            new_id_response.headers["x-request-id"],
+        ]
+        assert "total;dur=" in response.headers["server-timing"]
+        assert get_current_request_id() is None
+
+    @pytest.mark.parametrize(
+        "request_id", ["a" * 129, "forged id", "forged\tid", "id;forged"]
+    )
+    def test_request__with_invalid_x_request_id_header__expected_new_request_id(  # noqa
+        self, request_id: str
+    ) -> None:
+        """Test long or unsafe incoming request ids are not echoed."""
+        # FIXTURE
+        app = FastAPI()
+
+        @app.get("/tests")
+        def get_test() -> dict:
+            return {}
+
+        app.add_middleware(RequestIdLoggingMiddleware)
+        client = TestClient(app)
+
+        # EXERCISE
+        response = client.get("/tests", headers={"X-Request-ID": request_id})
+
+        # ASSERT
+        assert response.is_success
+        assert response.headers["x-request-id"] != request_id
+        assert str(uuid.UUID(response.headers["x-request-id"])) == (
+            response.headers["x-request-id"]
+        )
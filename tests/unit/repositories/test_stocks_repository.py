@@ -0,0 +1,68 @@
+from mock import MagicMock
+
+from api.repositories.stocks import SORTABLE_FIELDS, StockMetadataRepository
+
+
+class TestStockMetadataRepository:
+    """Test class to test the stock metadata repository."""
+
+    def test_missing_indexes__only_symbol_indexed__expected_other_sortable_fields(  # noqa
+        self,
+    ) -> None:
+        """Test sortable fields without an index are reported."""
+        # FIXTURE
+        database = MagicMock()
+        database.__getitem__.return_value.index_information.return_value = {
+            "_id_": {"key": [("_id", 1)]},
+            "symbol": {"key": [("symbol", 1)], "unique": True},
+        }
+        repository = StockMetadataRepository(database)
+
+        expected_missing = [
+            field for field in SORTABLE_FIELDS if field != "symbol"
+        ]
+
+        # EXERCISE
+        missing = repository.missing_indexes()
+
+        # ASSERT
+        assert missing == expected_missing
+
+    def test_ensure_indexes__all_indexes_created__expected_no_failures(
+        self,
+    ) -> None:
+        """Test every index in the specification is created."""
+        # FIXTURE
+        database = MagicMock()
+        collection = database.__getitem__.return_value
+        repository = StockMetadataRepository(database)
+
+        # EXERCISE
+        failed = repository.ensure_indexes()
+
+        # ASSERT
+        assert failed == []
+        assert collection.create_indexes.call_count == len(
+            StockMetadataRepository.INDEXES
+        )
+
+    def test_list__skip_past_stale_estimated_count__expected_exact_count(
+        self,
+    ) -> None:
+        """Test a skip past the estimated count is checked exactly."""
+        # FIXTURE
+        database = MagicMock()
+        collection = database.__getitem__.return_value
+        collection.estimated_document_count.return_value = 2
+        collection.count_documents.return_value = 6
+        cursor = collection.find.return_value
+        cursor.skip.return_value.limit.return_value.sort.return_value = []
+        repository = StockMetadataRepository(database)
+
+        # EXERCISE
+        stocks, count = repository.list(skip=4, limit=2, sort=[("symbol", 1)])
+
+        # ASSERT
+        assert stocks == []
+        assert count == 6
+        collection.count_documents.assert_called_once_with({})
@@ -0,0 +1,122 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from mock import MagicMock
+
+from api.repositories.storage import (
+    FileSystemStockSeriesRepository,
+    StockSeriesRepository,
+)
+from api.schemas.stock import STOCK_SERIES_COLUMNS_RENAMER
+from api.services.serializers import SerializerFactory
+
+BLOB_DATA = bytes(range(256)) * 40
+STOCKS_BUCKET = "tests/integration/data/stocks-bucket"
+
+
+def _download_as_bytes(
+    start: int = None, end: int = None, checksum: str = None
+) -> bytes:
+    return BLOB_DATA[start : end + 1]  # noqa: E203
+
+
+class TestStockSeriesRepository:
+    """Test class to test the stock series repository."""
+
+    def setup_method(self) -> None:
+        """Set up a repository client that serves BLOB_DATA."""
+        self.blob = MagicMock()
+        self.blob.download_as_bytes.side_effect = _download_as_bytes
+        self.blob.download_to_file.side_effect = lambda buffer: buffer.write(
+            BLOB_DATA
+        )
+
+        self.client = MagicMock()
+        self.client.bucket.return_value.blob.return_value = self.blob
+
+        self.executor = ThreadPoolExecutor(max_workers=4)
+
+    def teardown_method(self) -> None:
+        """Teardown any state that was previously setup."""
+        self.executor.shutdown()
+
+    def test_download_as_buffer__blob_above_threshold__expected_parallel_ranged_download(  # noqa
+        self,
+    ) -> None:
+        """Test large blobs are downloaded as byte ranges."""
+        # FIXTURE
+        repository = StockSeriesRepository(
+            "stocks-bucket",
+            "csv",
+            client=self.client,
+            executor=self.executor,
+            ranged_download_threshold=1024,
+            ranged_download_chunk_size=1000,
+        )
+
+        # EXERCISE
+        buffered_data = repository.download_as_buffer(
+            "NTPC.csv", generation=1, size=len(BLOB_DATA)
+        )
+
+        # ASSERT
+        assert buffered_data.read() == BLOB_DATA
+        assert self.blob.download_as_bytes.call_count == 11
+        self.blob.download_to_file.assert_not_called()
+        self.client.bucket.return_value.blob.assert_called_with(
+            "csv/NTPC.csv", generation=1
+        )
+
+    def test_download_as_buffer__blob_below_threshold__expected_single_download(  # noqa
+        self,
+    ) -> None:
+        """Test small blobs are downloaded in a single request."""
+        # FIXTURE
+        repository = StockSeriesRepository(
+            "stocks-bucket",
+            "csv",
+            client=self.client,
+            executor=self.executor,
+        )
+
+        # EXERCISE
+        buffered_data = repository.download_as_buffer(
+            "NTPC.csv", size=len(BLOB_DATA)
+        )
+
+        # ASSERT
+        assert buffered_data.read() == BLOB_DATA
+        self.blob.download_as_bytes.assert_not_called()
+
+
+class TestFileSystemStockSeriesRepository:
+    """Test class to test the filesystem stock series repository."""
+
+    def test_download_as_buffer__json_series__expected_same_dataframe_as_bytes(  # noqa
+        self,
+    ) -> None:
+        """Test mapped series parse the same as downloaded bytes."""
+        # FIXTURE
+        repository = FileSystemStockSeriesRepository(STOCKS_BUCKET, "json")
+        serializer = SerializerFactory().with_format("json").build()
+
+        with open(f"{STOCKS_BUCKET}/json/ADANIPORTS.json", "rb") as json_file:
+            expected_dataframe = serializer.serialize(
+                io.BytesIO(json_file.read()), STOCK_SERIES_COLUMNS_RENAMER
+            )
+
+        # EXERCISE
+        blob = repository.get_blob("ADANIPORTS.json")
+        missing_blob = repository.get_blob("MISSING.json")
+
+        with repository.download_as_buffer("ADANIPORTS.json") as mapped_data:
+            dataframe = serializer.serialize(
+                mapped_data, STOCK_SERIES_COLUMNS_RENAMER
+            )
+
+        # ASSERT
+        assert blob.name == "json/ADANIPORTS.json"
+        assert blob.generation is not None
+        assert missing_blob is None
+        pd.testing.assert_frame_equal(dataframe, expected_dataframe)
@@ -0,0 +1,101 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict
+
+import httpx
+from bson import ObjectId
+from mock import MagicMock
+
+from tests.integration.helper import set_envs_for_tests
+
+STOCK_SERIES = "tests/integration/data/stocks-bucket/csv/NESTLEIND.csv"
+
+CONCURRENT_REQUESTS = 5
+MONGO_LATENCY = 0.1
+STORAGE_LATENCY = 0.2
+
+
+def _find_one(filter: Dict) -> Dict:
+    time.sleep(MONGO_LATENCY)
+    return {
+        "_id": filter["_id"],
+        "company_name": "Nestle India Ltd.",
+        "industry": "CONSUMER GOODS",
+        "symbol": "NESTLEIND",
+        "series": "EQ",
+        "isin_code": "INE239A01016",
+        "file_format": "csv",
+        "created_at": datetime(2023, 10, 4),
+        "last_updated": datetime(2023, 10, 4),
+    }
+
+
+def _download_to_file(buffered_data: object) -> None:
+    time.sleep(STORAGE_LATENCY)
+    with open(STOCK_SERIES, "rb") as series_file:
+        buffered_data.write(series_file.read())
+
+
+class TestStocksRoutesConcurrency:
+    """Test class to test requests do not block each other."""
+
+    def setup_class(self) -> None:
+        """Class setup."""
+        set_envs_for_tests()
+
+        from api.main import app
+
+        self.app = app
+
+    def setup_method(self) -> None:
+        """Override database and storage with slow blocking fakes."""
+        from api.dependencies.cache import get_blob_cache, get_series_cache
+        from api.dependencies.database import get_database
+        from api.dependencies.storage import get_storage_client
+
+        database = MagicMock()
+        database.__getitem__.return_value.find_one.side_effect = _find_one
+
+        blob = MagicMock(generation=1, size=1024, updated=None)
+        blob.download_to_file.side_effect = _download_to_file
+
+        storage_client = MagicMock()
+        storage_client.bucket.return_value.get_blob.return_value = blob
+        storage_client.bucket.return_value.blob.return_value = blob
+
+        overrides = self.app.dependency_overrides
+        overrides[get_database] = lambda: database
+        overrides[get_storage_client] = lambda: storage_client
+        overrides[get_series_cache] = lambda: None
+        overrides[get_blob_cache] = lambda: None
+
+    def teardown_method(self) -> None:
+        """Teardown any state that was previously setup."""
+        self.app.dependency_overrides.clear()
+
+    async def _get_concurrently(self, path: str) -> list:
+        async with httpx.AsyncClient(
+            app=self.app, base_url="http://test"
+        ) as client:
+            return await asyncio.gather(
+                *[client.get(path) for _ in range(CONCURRENT_REQUESTS)]
+            )
+
+    def test_get_stock_data__concurrent_requests__expected_requests_not_serialized(  # noqa
+        self,
+    ) -> None:
+        """Test blocking I/O does not serialize concurrent requests."""
+        # FIXTURE
+        serial_time = CONCURRENT_REQUESTS * (MONGO_LATENCY + STORAGE_LATENCY)
+
+        # EXERCISE
+        start = time.perf_counter()
+        responses = asyncio.run(
+            self._get_concurrently(f"/api/v1/stocks/{ObjectId()}")
+        )
+        elapsed = time.perf_counter() - start
+
+        # ASSERT
+        assert all(response.is_success for response in responses)
+        assert elapsed < serial_time / 2
@@ -0,0 +1,145 @@
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from api.services.cache import (
+    SeriesCache,
+    SeriesCacheKey,
+    SeriesSidecarCache,
+)
+
+
+def _series(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({"close": [float(i) for i in range(rows)]})
+
+
+def _size(data: pd.DataFrame) -> int:
+    return int(data.memory_usage(index=True, deep=True).sum())
+
+
+class TestSeriesCache:
+    """Test class to test the series cache."""
+
+    def test_get__missing_then_cached_series__expected_miss_then_hit(
+        self,
+    ) -> None:
+        """Test hit and miss counters."""
+        # FIXTURE
+        cache = SeriesCache(max_bytes=1024 * 1024)
+        key = SeriesCacheKey("NTPC", "csv", 1)
+        data = _series(10)
+
+        # EXERCISE
+        missing = cache.get(key)
+        cache.put(key, data)
+        cached = cache.get(key)
+
+        # ASSERT
+        assert missing is None
+        assert cached is data
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_put__over_memory_budget__expected_least_recently_used_evicted(  # noqa
+        self,
+    ) -> None:
+        """Test LRU eviction when the memory budget is exceeded."""
+        # FIXTURE
+        data = _series(100)
+        cache = SeriesCache(max_bytes=_size(data) * 2)
+        first_key = SeriesCacheKey("NTPC", "csv", 1)
+        second_key = SeriesCacheKey("TCS", "csv", 1)
+        third_key = SeriesCacheKey("UPL", "csv", 1)
+
+        # EXERCISE
+        cache.put(first_key, data)
+        cache.put(second_key, data)
+        cache.get(first_key)
+        cache.put(third_key, data)
+
+        # ASSERT
+        assert cache.get(first_key) is data
+        assert cache.get(second_key) is None
+        assert cache.get(third_key) is data
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["size_bytes"] == _size(data) * 2
+
+    def test_put__new_blob_generation__expected_old_generation_dropped(
+        self,
+    ) -> None:
+        """Test a new generation replaces the previous one."""
+        # FIXTURE
+        cache = SeriesCache(max_bytes=1024 * 1024)
+        old_key = SeriesCacheKey("NTPC", "csv", 1)
+        new_key = SeriesCacheKey("NTPC", "csv", 2)
+
+        # EXERCISE
+        cache.put(old_key, _series(10))
+        cache.put(new_key, _series(10))
+
+        # ASSERT
+        assert cache.get(old_key) is None
+        assert cache.get(new_key) is not None
+        assert cache.stats()["entries"] == 1
+
+    def test_put__series_larger_than_budget__expected_not_cached(
+        self,
+    ) -> None:
+        """Test a series bigger than the whole budget is skipped."""
+        # FIXTURE
+        cache = SeriesCache(max_bytes=16)
+        key = SeriesCacheKey("NTPC", "csv", 1)
+
+        # EXERCISE
+        cache.put(key, _series(100))
+
+        # ASSERT
+        assert cache.get(key) is None
+        assert cache.stats()["size_bytes"] == 0
+
+
+class TestSeriesSidecarCache:
+    """Test class to test the series sidecar cache."""
+
+    def test_get__after_put__expected_same_series(
+        self, tmp_path: Path
+    ) -> None:
+        """Test a series is read back from its sidecar."""
+        # FIXTURE
+        cache = SeriesSidecarCache(str(tmp_path))
+        key = SeriesCacheKey("NTPC", "xlsx", 1)
+        data = pd.DataFrame({"date": ["2020-01-01"], "close": [1.0]})
+
+        # EXERCISE
+        missing = cache.get(key)
+        cache.put(key, data)
+        cached = cache.get(key)
+        projected = cache.get(key, columns=["close"])
+
+        # ASSERT
+        assert missing is None
+        pd.testing.assert_frame_equal(cached, data)
+        pd.testing.assert_frame_equal(projected, data[["close"]])
+
+    def test_put__new_generation__expected_old_generation_removed(  # noqa
+        self, tmp_path: Path
+    ) -> None:
+        """Test a new blob generation invalidates the old sidecar."""
+        # FIXTURE
+        cache = SeriesSidecarCache(str(tmp_path))
+        old_key = SeriesCacheKey("NTPC", "xlsx", 1)
+        new_key = SeriesCacheKey("NTPC", "xlsx", 2)
+        other_key = SeriesCacheKey("ONGC", "xlsx", 1)
+        data = _series(10)
+
+        # EXERCISE
+        cache.put(old_key, data)
+        cache.put(other_key, data)
+        cache.put(new_key, _series(20))
+
+        # ASSERT
+        assert cache.get(old_key) is None
+        assert len(cache.get(new_key)) == 20
+        assert cache.get(other_key) is not None
+        assert len(os.listdir(tmp_path)) == 2
@@ -0,0 +1,63 @@
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+
+from api.schemas.stock import Stock
+from api.services.encoders import encode_stock_series_arrow
+
+
+def _stock() -> Stock:
+    return Stock(
+        id="651d4f2f0f5e9b1a2c3d4e5f",
+        company_name="Grasim Industries Ltd.",
+        industry="CEMENT & CEMENT PRODUCTS",
+        symbol="GRASIM",
+        series="EQ",
+        isin_code="INE047A01021",
+        file_format="xlsx",
+        created_at=datetime(2023, 10, 4),
+        last_updated=datetime(2023, 10, 4),
+    )
+
+
+class TestEncoders:
+    """Test class to test the series encoders."""
+
+    def test_encode_stock_series_arrow__string_dates_and_empty_series__expected_same_schema(  # noqa
+        self,
+    ) -> None:
+        """Test Arrow columns are typed by column, not by values."""
+        # FIXTURE
+        data = pd.DataFrame(
+            {
+                "date": ["2021-04-30", "2021-05-03"],
+                "symbol": ["GRASIM", "GRASIM"],
+                "close": [1385.5, 1402.0],
+                "volume": [1200.0, None],
+            }
+        )
+        empty_data = pd.DataFrame(
+            {column: [] for column in data.columns}, dtype=object
+        )
+
+        # EXERCISE
+        table = pa.ipc.open_stream(
+            encode_stock_series_arrow(_stock(), data)
+        ).read_all()
+        empty_table = pa.ipc.open_stream(
+            encode_stock_series_arrow(_stock(), empty_data)
+        ).read_all()
+
+        # ASSERT
+        assert table.schema.remove_metadata() == pa.schema(
+            [
+                ("date", pa.timestamp("ns")),
+                ("symbol", pa.string()),
+                ("close", pa.float64()),
+                ("volume", pa.int64()),
+            ]
+        )
+        assert empty_table.schema == table.schema
+        assert empty_table.num_rows == 0
+        assert table.column("volume").to_pylist() == [1200, None]
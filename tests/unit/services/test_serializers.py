@@ -0,0 +1,214 @@
+import io
+import json
+
+import pandas as pd
+
+from api.schemas.serializer import SerializerType
+from api.schemas.stock import STOCK_SERIES_COLUMNS_RENAMER
+from api.services.serializers import SerializerFactory
+
+STOCKS_BUCKET = "tests/integration/data/stocks-bucket"
+
+
+class TestSerializers:
+    """Test class to test series serializers."""
+
+    def test_serialize__parquet_converted_from_csv__expected_same_dataframe(  # noqa
+        self,
+    ) -> None:
+        """Test parquet serializer reads the same data as the csv one."""
+        # FIXTURE
+        with open(f"{STOCKS_BUCKET}/csv/NESTLEIND.csv", "rb") as csv_file:
+            csv_data = csv_file.read()
+
+        expected_dataframe = (
+            SerializerFactory()
+            .with_format(SerializerType.CSV)
+            .build()
+            .serialize(io.BytesIO(csv_data), STOCK_SERIES_COLUMNS_RENAMER)
+        )
+
+        parquet_data = io.BytesIO()
+        source_dataframe = pd.read_csv(io.BytesIO(csv_data))
+        source_dataframe.to_parquet(parquet_data, index=False)
+        parquet_data.seek(0)
+
+        # EXERCISE
+        dataframe = (
+            SerializerFactory()
+            .with_format(SerializerType.PARQUET)
+            .build()
+            .serialize(parquet_data, STOCK_SERIES_COLUMNS_RENAMER)
+        )
+
+        # ASSERT
+        pd.testing.assert_frame_equal(dataframe, expected_dataframe)
+
+    def test_iter_serialize__csv_in_chunks__expected_same_dataframe(
+        self,
+    ) -> None:
+        """Test chunked csv reads concatenate to the full read."""
+        # FIXTURE
+        with open(f"{STOCKS_BUCKET}/csv/NESTLEIND.csv", "rb") as csv_file:
+            csv_data = csv_file.read()
+
+        serializer = (
+            SerializerFactory().with_format(SerializerType.CSV).build()
+        )
+        columns = ["date", "close", "volume"]
+
+        expected_dataframe = serializer.serialize(
+            io.BytesIO(csv_data), STOCK_SERIES_COLUMNS_RENAMER, columns=columns
+        )
+
+        # EXERCISE
+        chunks = list(
+            serializer.iter_serialize(
+                io.BytesIO(csv_data),
+                STOCK_SERIES_COLUMNS_RENAMER,
+                columns=columns,
+                chunk_rows=1000,
+            )
+        )
+
+        # ASSERT
+        assert len(chunks) == -(-len(expected_dataframe) // 1000)
+        assert expected_dataframe["date"].dtype == "datetime64[ns]"
+        pd.testing.assert_frame_equal(pd.concat(chunks), expected_dataframe)
+
+    def test_iter_serialize__parquet_in_chunks__expected_same_dataframe(
+        self,
+    ) -> None:
+        """Test chunked parquet reads concatenate to the full read."""
+        # FIXTURE
+        parquet_data = io.BytesIO()
+        pd.read_csv(f"{STOCKS_BUCKET}/csv/NESTLEIND.csv").to_parquet(
+            parquet_data, index=False
+        )
+
+        serializer = (
+            SerializerFactory().with_format(SerializerType.PARQUET).build()
+        )
+        columns = ["date", "close", "volume"]
+
+        parquet_data.seek(0)
+        expected_dataframe = serializer.serialize(
+            parquet_data, STOCK_SERIES_COLUMNS_RENAMER, columns=columns
+        )
+
+        # EXERCISE
+        parquet_data.seek(0)
+        chunks = list(
+            serializer.iter_serialize(
+                parquet_data,
+                STOCK_SERIES_COLUMNS_RENAMER,
+                columns=columns,
+                chunk_rows=100,
+            )
+        )
+
+        # ASSERT
+        assert len(chunks) == -(-len(expected_dataframe) // 100)
+        assert list(chunks[0].columns) == columns
+        pd.testing.assert_frame_equal(pd.concat(chunks), expected_dataframe)
+
+    def test_serialize__csv_with_pyarrow_engine__expected_same_dataframe(
+        self,
+    ) -> None:
+        """Test the pyarrow csv engine reads the same data as the c one."""
+        # FIXTURE
+        with open(f"{STOCKS_BUCKET}/csv/NESTLEIND.csv", "rb") as csv_file:
+            csv_data = csv_file.read()
+
+        expected_dataframe = (
+            SerializerFactory()
+            .with_format(SerializerType.CSV)
+            .with_options(engine="c")
+            .build()
+            .serialize(io.BytesIO(csv_data), STOCK_SERIES_COLUMNS_RENAMER)
+        )
+
+        # EXERCISE
+        dataframe = (
+            SerializerFactory()
+            .with_format(SerializerType.CSV)
+            .with_options(engine="pyarrow")
+            .build()
+            .serialize(io.BytesIO(csv_data), STOCK_SERIES_COLUMNS_RENAMER)
+        )
+
+        # ASSERT
+        pd.testing.assert_frame_equal(dataframe, expected_dataframe)
+
+    def test_serialize__json_records_and_columns__expected_same_dataframe(
+        self,
+    ) -> None:
+        """Test record and column oriented json read the same data."""
+        # FIXTURE
+        with open(f"{STOCKS_BUCKET}/json/ADANIPORTS.json", "rb") as json_file:
+            columns_data = json_file.read()
+
+        records_data = (
+            pd.DataFrame(json.loads(columns_data))
+            .to_json(orient="records")
+            .encode()
+        )
+
+        serializer = (
+            SerializerFactory().with_format(SerializerType.JSON).build()
+        )
+
+        # EXERCISE
+        columns_dataframe = serializer.serialize(
+            io.BytesIO(columns_data), STOCK_SERIES_COLUMNS_RENAMER
+        )
+        records_dataframe = serializer.serialize(
+            io.BytesIO(records_data), STOCK_SERIES_COLUMNS_RENAMER
+        )
+
+        # ASSERT
+        assert columns_dataframe["date"].dtype == "datetime64[ns]"
+        assert columns_dataframe["close"].dtype == "float64"
+        pd.testing.assert_frame_equal(records_dataframe, columns_dataframe)
+
+    def test_serialize__csv_and_parquet_with_missing_volume__expected_float_volume(  # noqa
+        self,
+    ) -> None:
+        """Test integer columns with missing values are read as floats."""
+        # FIXTURE
+        with open(f"{STOCKS_BUCKET}/csv/NESTLEIND.csv", "rb") as csv_file:
+            source_dataframe = pd.read_csv(csv_file)
+
+        source_dataframe.loc[1, "Volume"] = None
+
+        csv_data = io.BytesIO(source_dataframe.to_csv(index=False).encode())
+        parquet_data = io.BytesIO()
+        source_dataframe.to_parquet(parquet_data, index=False)
+        parquet_data.seek(0)
+
+        # EXERCISE
+        csv_dataframe = (
+            SerializerFactory()
+            .with_format(SerializerType.CSV)
+            .build()
+            .serialize(csv_data, STOCK_SERIES_COLUMNS_RENAMER)
+        )
+        parquet_dataframe = (
+            SerializerFactory()
+            .with_format(SerializerType.PARQUET)
+            .build()
+            .serialize(parquet_data, STOCK_SERIES_COLUMNS_RENAMER)
+        )
+
+        # ASSERT
+        assert csv_dataframe["volume"].dtype == "float64"
+        assert csv_dataframe["volume"].isna().tolist()[:3] == [
+            False,
+            True,
+            False,
+        ]
+        assert (
+            csv_dataframe["volume"].iloc[0]
+            == source_dataframe["Volume"].iloc[0]
+        )
+        pd.testing.assert_frame_equal(parquet_dataframe, csv_dataframe)
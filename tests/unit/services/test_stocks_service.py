@@ -0,0 +1,125 @@
+import asyncio
+from datetime import date, datetime
+from io import BytesIO
+
+import pandas as pd
+from mock import MagicMock
+
+from api.schemas.stock import Stock
+from api.services.cache import SeriesCache
+from api.services.serializers import CsvSerializer
+from api.services.stocks import StockService
+from api.utils.ttl_cache import TTLCache
+
+STOCK_SERIES = "tests/integration/data/stocks-bucket/csv/NESTLEIND.csv"
+
+
+def _stock() -> Stock:
+    return Stock(
+        id="651d4f2f0f5e9b1a2c3d4e5f",
+        company_name="Nestle India Ltd.",
+        industry="CONSUMER GOODS",
+        symbol="NESTLEIND",
+        series="EQ",
+        isin_code="INE239A01016",
+        file_format="csv",
+        created_at=datetime(2023, 10, 4),
+        last_updated=datetime(2023, 10, 4),
+    )
+
+
+def _download_as_buffer(*args: object, **kwargs: object) -> BytesIO:
+    with open(STOCK_SERIES, "rb") as series_file:
+        return BytesIO(series_file.read())
+
+
+class TestStockService:
+    """Test class to test the stock service."""
+
+    def test_get_dataframe__projected_reads_with_caches__expected_projection_pushed_down(  # noqa
+        self,
+    ) -> None:
+        """Test projected reads are pushed down while the cache is enabled.
+
+        Projected reads on a cache miss are not cached, full reads are, and
+        projected reads are then served from the cached full series.
+        """
+        # FIXTURE
+        stock_metadata_repository = MagicMock()
+        stock_metadata_repository.get_by_id.return_value = _stock()
+
+        series_repository = MagicMock()
+        series_repository.get_blob.return_value = MagicMock(
+            generation=1, size=1024, updated=None
+        )
+        series_repository.download_as_buffer.side_effect = _download_as_buffer
+
+        series_cache = SeriesCache(64 * 1024 * 1024)
+        service = StockService(
+            stock_metadata_repository,
+            series_repository,
+            series_repository,
+            series_repository,
+            series_repository,
+            series_cache=series_cache,
+            blob_cache=TTLCache(60),
+        )
+
+        serializer = MagicMock(wraps=CsvSerializer())
+        service._build_serializer = MagicMock(return_value=serializer)
+
+        # EXERCISE
+        _, close = asyncio.run(
+            service.get_dataframe(_stock().id, fields=["close"])
+        )
+        _, full = asyncio.run(service.get_dataframe(_stock().id))
+        _, volume = asyncio.run(
+            service.get_dataframe(_stock().id, fields=["volume"])
+        )
+
+        # ASSERT
+        assert list(close.columns) == ["date", "close"]
+        assert list(volume.columns) == ["date", "volume"]
+        assert len(full.columns) > 2
+        assert [
+            call.kwargs["columns"] for call in serializer.serialize.mock_calls
+        ] == [["date", "close"], None]
+        assert series_repository.get_blob.call_count == 1
+        assert series_repository.download_as_buffer.call_count == 2
+        assert series_cache.stats()["hits"] == 1
+
+    def test_iter_dataframe__date_range_without_cache__expected_same_rows_as_get_dataframe(  # noqa
+        self,
+    ) -> None:
+        """Test a series read in chunks has the rows of a whole read."""
+        # FIXTURE
+        stock_metadata_repository = MagicMock()
+        stock_metadata_repository.get_by_id.return_value = _stock()
+
+        series_repository = MagicMock()
+        series_repository.get_blob.return_value = MagicMock(
+            generation=1, size=1024, updated=None
+        )
+        series_repository.download_as_buffer.side_effect = _download_as_buffer
+
+        service = StockService(
+            stock_metadata_repository,
+            series_repository,
+            series_repository,
+            series_repository,
+            series_repository,
+        )
+        start, end = date(2015, 1, 1), date(2016, 12, 31)
+
+        # EXERCISE
+        _, frames = asyncio.run(
+            service.iter_dataframe(_stock().id, start=start, end=end)
+        )
+        streamed = pd.concat(list(frames))
+        _, data = asyncio.run(
+            service.get_dataframe(_stock().id, start=start, end=end)
+        )
+
+        # ASSERT
+        assert not streamed.empty
+        pd.testing.assert_frame_equal(streamed, data)
@@ -0,0 +1,40 @@
+from api.utils.content_negotiation import negotiate_media_type
+
+MEDIA_TYPES = [
+    "application/json",
+    "application/vnd.apache.arrow.stream",
+    "application/msgpack",
+]
+
+
+class TestContentNegotiation:
+    """Test class to test the Accept header negotiation."""
+
+    def test_negotiate_media_type__quality_values__expected_highest_quality_media_type(  # noqa
+        self,
+    ) -> None:
+        """Test quality values, wildcards and ties are honoured."""
+        # EXERCISE
+        refused = negotiate_media_type(
+            "application/json, application/msgpack;q=0", MEDIA_TYPES
+        )
+        preferred = negotiate_media_type(
+            "application/json;q=0.5, application/msgpack", MEDIA_TYPES
+        )
+        listed_first = negotiate_media_type(
+            "application/vnd.apache.arrow.stream, application/json",
+            MEDIA_TYPES,
+        )
+        wildcard = negotiate_media_type("text/html, */*;q=0.1", MEDIA_TYPES)
+        missing = negotiate_media_type(None, MEDIA_TYPES)
+        not_acceptable = negotiate_media_type(
+            "text/html, application/*;q=0", MEDIA_TYPES
+        )
+
+        # ASSERT
+        assert refused == "application/json"
+        assert preferred == "application/msgpack"
+        assert listed_first == "application/vnd.apache.arrow.stream"
+        assert wildcard == "application/json"
+        assert missing == "application/json"
+        assert not_acceptable is None
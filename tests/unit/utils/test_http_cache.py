@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+
+from api.utils.http_cache import is_not_modified
+
+
+class TestHttpCache:
+    """Test class to test conditional request evaluation."""
+
+    LAST_MODIFIED = datetime(2023, 10, 4, 12, 0, 0, tzinfo=timezone.utc)
+
+    def test_is_not_modified__weak_etag_in_list__expected_not_modified(
+        self,
+    ) -> None:
+        """Test If-None-Match uses the weak comparison over a tag list."""
+        # FIXTURE
+        headers = {"if-none-match": '"other", W/"abc"'}
+
+        # EXERCISE
+        not_modified = is_not_modified(headers, '"abc"', self.LAST_MODIFIED)
+
+        # ASSERT
+        assert not_modified
+
+    def test_is_not_modified__if_none_match_mismatch_and_old_date__expected_modified(  # noqa
+        self,
+    ) -> None:
+        """Test If-Modified-Since is ignored when If-None-Match is set."""
+        # FIXTURE
+        headers = {
+            "if-none-match": '"other"',
+            "if-modified-since": "Wed, 04 Oct 2023 13:00:00 GMT",
+        }
+
+        # EXERCISE
+        not_modified = is_not_modified(headers, '"abc"', self.LAST_MODIFIED)
+
+        # ASSERT
+        assert not not_modified
+
+    def test_is_not_modified__if_modified_since__expected_compared_to_last_modified(  # noqa
+        self,
+    ) -> None:
+        """Test If-Modified-Since against the last modification date."""
+        # EXERCISE
+        same_date = is_not_modified(
+            {"if-modified-since": "Wed, 04 Oct 2023 12:00:00 GMT"},
+            '"abc"',
+            self.LAST_MODIFIED,
+        )
+        older_date = is_not_modified(
+            {"if-modified-since": "Wed, 04 Oct 2023 11:59:59 GMT"},
+            '"abc"',
+            self.LAST_MODIFIED,
+        )
+        invalid_date = is_not_modified(
+            {"if-modified-since": "yesterday"}, '"abc"', self.LAST_MODIFIED
+        )
+
+        # ASSERT
+        assert same_date
+        assert not older_date
+        assert not invalid_date
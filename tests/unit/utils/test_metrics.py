@@ -0,0 +1,104 @@
+from fastapi import FastAPI
+from prometheus_client import REGISTRY
+
+from api.utils.metrics import observe_count, observe_request, route_path
+
+
+def _count_sample(name: str, strategy: str) -> float:
+    return (
+        REGISTRY.get_sample_value(
+            f"stocks_api_count_duration_seconds_{name}",
+            {"strategy": strategy},
+        )
+        or 0
+    )
+
+
+class TestMetrics:
+    """Test class to test the Prometheus metrics."""
+
+    def test_observe_request__same_route_twice__expected_count_and_latency_recorded(  # noqa
+        self,
+    ) -> None:
+        """Test requests are counted and timed by route."""
+        # FIXTURE
+        labels = {"method": "GET", "route": "/tests/{id}"}
+
+        # EXERCISE
+        observe_request("GET", "/tests/{id}", 200, 0.25)
+        observe_request("GET", "/tests/{id}", 200, 0.5)
+
+        # ASSERT
+        assert (
+            REGISTRY.get_sample_value(
+                "stocks_api_requests_total", {**labels, "status": "200"}
+            )
+            == 2
+        )
+        assert (
+            REGISTRY.get_sample_value(
+                "stocks_api_request_duration_seconds_sum", labels
+            )
+            == 0.75
+        )
+
+    def test_observe_count__two_strategies__expected_latency_recorded_by_strategy(  # noqa
+        self,
+    ) -> None:
+        """Test stock counts are timed by count strategy."""
+        # FIXTURE
+        exact_sum = _count_sample("sum", "exact")
+        estimated_count = _count_sample("count", "estimated")
+
+        # EXERCISE
+        observe_count("exact", 0.25)
+        observe_count("estimated", 0.5)
+
+        # ASSERT
+        assert _count_sample("sum", "exact") == exact_sum + 0.25
+        assert _count_sample("count", "estimated") == estimated_count + 1
+
+    def test_route_path__matched_and_unmatched_requests__expected_route_template(  # noqa
+        self,
+    ) -> None:
+        """Test requests are labeled with their route path template."""
+        # FIXTURE
+        app = FastAPI()
+
+        @app.get("/tests/{id}")
+        def get_test(id: str) -> str:
+            return id
+
+        matched_scope = {"app": app, "endpoint": get_test}
+        unmatched_scope = {"app": app}
+
+        # EXERCISE
+        matched_route = route_path(matched_scope)
+        unmatched_route = route_path(unmatched_scope)
+
+        # ASSERT
+        assert matched_route == "/tests/{id}"
+        assert unmatched_route == "unmatched"
+
+    def test_route_path__same_endpoint_twice__expected_routes_scanned_once(  # noqa
+        self,
+    ) -> None:
+        """Test route path templates are looked up once per endpoint."""
+        # FIXTURE
+        app = FastAPI()
+
+        @app.get("/tests/{id}/once")
+        def get_test(id: str) -> str:
+            return id
+
+        scope = {"app": app, "endpoint": get_test}
+        routed_scope = {"app": app, "route": app.routes[-1]}
+
+        # EXERCISE
+        first_route = route_path(scope)
+        app.router.routes.clear()
+        second_route = route_path(scope)
+
+        # ASSERT
+        assert first_route == second_route == "/tests/{id}/once"
+        assert route_path(routed_scope) == "/tests/{id}/once"
@@ -0,0 +1,46 @@
+from api.utils.timing import (
+    record_stage,
+    server_timing,
+    stage,
+    start_timings,
+    stop_timings,
+)
+
+
+class TestTiming:
+    """Test class to test the request stage timers."""
+
+    def test_stage__stage_run_twice__expected_times_added_up(self) -> None:
+        """Test stages of a request add up and are formatted in order."""
+        # FIXTURE
+        token = start_timings()
+
+        # EXERCISE
+        record_stage("mongo", 0.002)
+        record_stage("parse", 0.0105)
+        record_stage("mongo", 0.001)
+
+        with stage("encoding"):
+            pass
+
+        timings = stop_timings(token)
+
+        # ASSERT
+        assert list(timings) == ["mongo", "parse", "encoding"]
+        assert server_timing({**timings, "encoding": 0.0}) == (
+            "mongo;dur=3.00, parse;dur=10.50, encoding;dur=0.00"
+        )
+
+    def test_stage__outside_of_request__expected_nothing_recorded(
+        self,
+    ) -> None:
+        """Test stages timed outside of a request are not recorded."""
+        # EXERCISE
+        with stage("mongo"):
+            pass
+
+        token = start_timings()
+        timings = stop_timings(token)
+
+        # ASSERT
+        assert timings == {}
@@ -0,0 +1,39 @@
+from mock import patch
+
+from api.utils.ttl_cache import TTLCache
+
+
+class TestTTLCache:
+    """Test class to test the TTL cache."""
+
+    def test_get__entry_older_than_ttl__expected_expired(self) -> None:
+        """Test entries expire after the TTL."""
+        # FIXTURE
+        cache = TTLCache(ttl=30)
+
+        # EXERCISE
+        with patch("api.utils.ttl_cache.time.monotonic", return_value=100):
+            cache.set("stocks", 6)
+            fresh_value = cache.get("stocks")
+
+        with patch("api.utils.ttl_cache.time.monotonic", return_value=130):
+            expired_value = cache.get("stocks")
+
+        # ASSERT
+        assert fresh_value == 6
+        assert expired_value is None
+
+    def test_set__cache_full__expected_oldest_entry_dropped(self) -> None:
+        """Test the oldest entry is dropped when the cache is full."""
+        # FIXTURE
+        cache = TTLCache(ttl=30, max_entries=2)
+
+        # EXERCISE
+        cache.set("csv", 2)
+        cache.set("json", 2)
+        cache.set("xlsx", 2)
+
+        # ASSERT
+        assert cache.get("csv") is None
+        assert cache.get("json") == 2
+        assert cache.get("xlsx") == 2